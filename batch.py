@@ -0,0 +1,134 @@
+"""
+Zakaat Batch Module
+
+Calculates Zakaat for many households from a CSV file without the GUI.
+
+Input rows are one asset per line:
+
+    household,asset,amount,currency
+    smith,cash,1200,USD
+    smith,bank_balance,5000,EUR
+    smith,gold,20,
+
+Gold and silver amounts are grams and need no currency. Rows that fail
+validation are written to a reject file with the reasons.
+"""
+import argparse
+import csv
+import os
+import sys
+
+from calculator import (METAL_FIELDS, GOLD_PRICE_PER_GRAM,
+                        SILVER_PRICE_PER_GRAM, METAL_PRICE_CURRENCY, calculate)
+from currency import (DEFAULT_CURRENCY, RATES_SNAPSHOT_FILE, CachedRateProvider,
+                      HttpRateProvider, RateUnavailable, convert_amounts, pair_key)
+from validation import validate_rows
+
+INPUT_FIELDS = ['household', 'asset', 'amount', 'currency']
+OUTPUT_FIELDS = ['household', 'currency', 'net_assets', 'nisab_threshold', 'zakaat_amount']
+
+
+def read_rows(path):
+    with open(path, newline='') as f:
+        return list(csv.DictReader(f))
+
+
+def household_assets(rows, provider, currency=DEFAULT_CURRENCY):
+    """
+    Total the assets of each household from rows returned by validate_rows.
+
+    All monetary rows are converted in one grouped pass, so each currency
+    pair is looked up once for the whole batch. Returns (households,
+    metal_rate, rates) where metal_rate converts metal prices into currency.
+    """
+    amounts = [row['amount'] for row in rows]
+    currencies = [
+        METAL_PRICE_CURRENCY if row['asset'] in METAL_FIELDS else (row.get('currency') or currency)
+        for row in rows
+    ]
+    converted, rates = convert_amounts(amounts, currencies, currency, provider)
+
+    metal_rate = provider.rate(METAL_PRICE_CURRENCY, currency)
+    rates[pair_key(METAL_PRICE_CURRENCY, currency)] = metal_rate
+
+    households = {}
+    for row, amount, value in zip(rows, amounts, converted):
+        assets = households.setdefault(row['household'], {})
+        asset_id = row['asset']
+        # Metals stay in grams; their price is converted instead
+        assets[asset_id] = assets.get(asset_id, 0) + (amount if asset_id in METAL_FIELDS else value)
+    return households, metal_rate, rates
+
+
+def calculate_households(rows, provider, currency=DEFAULT_CURRENCY):
+    """
+    Calculate Zakaat per household for rows returned by validate_rows.
+
+    Returns (results, rates).
+    """
+    households, metal_rate, rates = household_assets(rows, provider, currency)
+    results = []
+    for household, assets in households.items():
+        result = calculate(
+            assets,
+            gold_price_per_gram=GOLD_PRICE_PER_GRAM * metal_rate,
+            silver_price_per_gram=SILVER_PRICE_PER_GRAM * metal_rate
+        )
+        result['household'] = household
+        result['currency'] = currency
+        results.append(result)
+    return results, rates
+
+
+def write_results(path, results):
+    with open(path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=OUTPUT_FIELDS)
+        writer.writeheader()
+        for result in results:
+            writer.writerow({
+                'household': result['household'],
+                'currency': result['currency'],
+                'net_assets': f"{result['net_assets']:.2f}",
+                'nisab_threshold': f"{result['nisab_threshold']:.2f}",
+                'zakaat_amount': f"{result['zakaat_amount']:.2f}"
+            })
+
+
+def write_rejects(path, rejects):
+    with open(path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=INPUT_FIELDS + ['errors'], extrasaction='ignore')
+        writer.writeheader()
+        for row, errors in rejects:
+            writer.writerow(dict(row, errors='; '.join(f"{field}: {error}"
+                                                       for field, error in errors.items())))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Calculate Zakaat for a CSV of household assets.')
+    parser.add_argument('input', help='CSV with household,asset,amount,currency columns')
+    parser.add_argument('output', help='CSV to write results to')
+    parser.add_argument('--currency', default=DEFAULT_CURRENCY, help='Reporting currency')
+    parser.add_argument('--rates', default=RATES_SNAPSHOT_FILE, help='FX rate snapshot file')
+    parser.add_argument('--offline', action='store_true', help='Use only the rate snapshot')
+    parser.add_argument('--rejects', help='CSV for invalid rows (default: <output>.rejects.csv)')
+    args = parser.parse_args(argv)
+
+    provider = CachedRateProvider(
+        None if args.offline else HttpRateProvider(),
+        snapshot_path=args.rates
+    )
+    rows, rejects = validate_rows(read_rows(args.input))
+    if rejects:
+        rejects_path = args.rejects or os.path.splitext(args.output)[0] + '.rejects.csv'
+        write_rejects(rejects_path, rejects)
+        print(f"{len(rejects)} invalid rows written to {rejects_path}", file=sys.stderr)
+
+    try:
+        results, _ = calculate_households(rows, provider, args.currency)
+    except RateUnavailable as e:
+        parser.exit(1, f"Error in calculation: {e}\n")
+    write_results(args.output, results)
+
+
+if __name__ == '__main__':
+    main()
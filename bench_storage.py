@@ -0,0 +1,38 @@
+"""
+Storage Benchmark
+
+Reports saves/sec for each DurableStore durability level:
+
+    python bench_storage.py [saves]
+"""
+import os
+import sys
+import tempfile
+import time
+
+from storage import DURABILITY_LEVELS, DurableStore
+
+
+def benchmark(directory, saves=500):
+    """Return saves/sec for each durability level."""
+    results = {}
+    for durability in DURABILITY_LEVELS:
+        path = os.path.join(directory, f"bench-{durability}.json")
+        start = time.perf_counter()
+        with DurableStore(path, durability) as store:
+            for i in range(saves):
+                store.put(f"calc_{i}", date='2026-01-01 00:00', net_assets=i, zakaat_amount=i * 0.025)
+        results[durability] = saves / (time.perf_counter() - start)
+    return results
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    saves = int(argv[0]) if argv else 500
+    with tempfile.TemporaryDirectory() as directory:
+        for durability, rate in benchmark(directory, saves).items():
+            print(f"{durability}: {rate:.0f} saves/sec")
+
+
+if __name__ == '__main__':
+    main()
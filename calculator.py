@@ -0,0 +1,72 @@
+"""
+Zakaat Calculation Module
+
+Pure calculation helpers shared by the GUI and the batch runner.
+"""
+
+# Constants
+NISAB_GOLD = 87.48  # Nisab threshold in grams of gold
+NISAB_SILVER = 612.36  # Nisab threshold in grams of silver
+ZAKAAT_RATE = 0.025  # 2.5%
+
+# For simplicity, we're using fixed metal prices. In a real app, you'd fetch current prices.
+GOLD_PRICE_PER_GRAM = 60  # Example price in USD
+SILVER_PRICE_PER_GRAM = 0.8  # Example price in USD
+METAL_PRICE_CURRENCY = 'USD'
+
+# Asset fields in form order
+ASSET_FIELDS = [
+    ('cash', 'Cash on Hand'),
+    ('bank_balance', 'Bank Balance'),
+    ('gold', 'Gold (grams)'),
+    ('silver', 'Silver (grams)'),
+    ('investments', 'Investments'),
+    ('business_assets', 'Business Assets'),
+    ('rental_income', 'Rental Income'),
+    ('other_assets', 'Other Assets'),
+    ('debts', 'Debts (to be subtracted)')
+]
+
+# Fields measured in grams rather than money
+METAL_FIELDS = ('gold', 'silver')
+MONETARY_FIELDS = tuple(asset_id for asset_id, _ in ASSET_FIELDS if asset_id not in METAL_FIELDS)
+
+
+def calculate(assets, gold_price_per_gram=GOLD_PRICE_PER_GRAM,
+              silver_price_per_gram=SILVER_PRICE_PER_GRAM):
+    """
+    Calculate Zakaat for a dict of asset values.
+
+    Monetary values and metal prices must be in the same currency.
+    Returns a dict with net_assets, nisab_threshold and zakaat_amount.
+    """
+    total_assets = (
+        assets.get('cash', 0) +
+        assets.get('bank_balance', 0) +
+        assets.get('investments', 0) +
+        assets.get('business_assets', 0) +
+        assets.get('rental_income', 0) +
+        assets.get('other_assets', 0)
+    )
+
+    # Subtract debts
+    net_assets = total_assets - assets.get('debts', 0)
+
+    nisab_gold_value = NISAB_GOLD * gold_price_per_gram
+    nisab_silver_value = NISAB_SILVER * silver_price_per_gram
+
+    # Use the lower of the two Nisab values
+    nisab_threshold = min(nisab_gold_value, nisab_silver_value)
+
+    # Add value of gold and silver
+    net_assets += assets.get('gold', 0) * gold_price_per_gram
+    net_assets += assets.get('silver', 0) * silver_price_per_gram
+
+    # Calculate Zakaat if above Nisab
+    zakaat_amount = net_assets * ZAKAAT_RATE if net_assets >= nisab_threshold else 0
+
+    return {
+        'net_assets': net_assets,
+        'nisab_threshold': nisab_threshold,
+        'zakaat_amount': zakaat_amount
+    }
@@ -0,0 +1,191 @@
+"""
+Currency Conversion Module
+
+FX-rate providers, a TTL rate cache backed by an on-disk snapshot, and
+grouped conversion of currency-tagged amounts into a reporting currency.
+"""
+import json
+import os
+import threading
+import time
+
+from storage import atomic_write_json
+
+DEFAULT_CURRENCY = 'USD'
+CURRENCIES = ('USD', 'EUR', 'GBP', 'INR', 'PKR', 'SAR', 'AED', 'MYR', 'IDR', 'TRY', 'EGP', 'BDT')
+CURRENCY_SYMBOLS = {'USD': '$', 'EUR': '€', 'GBP': '£'}
+
+RATES_SNAPSHOT_FILE = 'zakaat_rates.json'
+RATES_TTL = 6 * 60 * 60  # Seconds before a cached rate is refetched
+
+# Example rates against USD used by the offline provider
+FAKE_USD_RATES = {
+    'USD': 1.0,
+    'EUR': 0.92,
+    'GBP': 0.79,
+    'INR': 83.0,
+    'PKR': 278.0,
+    'SAR': 3.75,
+    'AED': 3.67,
+    'MYR': 4.7,
+    'IDR': 15600.0,
+    'TRY': 32.0,
+    'EGP': 47.0,
+    'BDT': 110.0
+}
+
+
+class RateUnavailable(Exception):
+    """Raised when no rate can be found for a currency pair."""
+
+
+def pair_key(base, quote):
+    return f"{base}:{quote}"
+
+
+def format_amount(amount, currency=DEFAULT_CURRENCY):
+    symbol = CURRENCY_SYMBOLS.get(currency)
+    if symbol:
+        return f"{symbol}{amount:.2f}"
+    return f"{amount:.2f} {currency}"
+
+
+class FakeRateProvider:
+    """Offline provider that crosses a fixed table of USD rates."""
+
+    def __init__(self, usd_rates=None):
+        self.usd_rates = dict(FAKE_USD_RATES if usd_rates is None else usd_rates)
+        self.calls = 0
+
+    def rate(self, base, quote):
+        self.calls += 1
+        try:
+            return self.usd_rates[quote] / self.usd_rates[base]
+        except KeyError:
+            raise RateUnavailable(f"No rate for {base} to {quote}")
+
+
+class HttpRateProvider:
+    """Fetches latest rates from an open exchange-rate API."""
+
+    url = 'https://open.er-api.com/v6/latest/{base}'
+
+    def __init__(self, url=None, timeout=5):
+        if url:
+            self.url = url
+        self.timeout = timeout
+
+    def rates(self, base):
+        """Return every quote the API has for base, as one request."""
+        # Imported here so modules that only need CURRENCIES skip the network stack
+        from urllib.request import urlopen
+        try:
+            with urlopen(self.url.format(base=base), timeout=self.timeout) as response:
+                data = json.load(response)
+            return {quote: float(rate) for quote, rate in data['rates'].items()}
+        except (OSError, ValueError, KeyError, TypeError, AttributeError) as e:
+            raise RateUnavailable(f"Failed to fetch rates for {base}: {e}")
+
+    def rate(self, base, quote):
+        try:
+            return self.rates(base)[quote]
+        except KeyError:
+            raise RateUnavailable(f"No rate for {base} to {quote}")
+
+
+class CachedRateProvider:
+    """
+    Wraps a provider with an in-memory TTL cache and an on-disk snapshot.
+
+    Fresh snapshot entries are reused across runs. Providers with a
+    rates(base) method have every quote of a response cached. If the
+    wrapped provider fails (or is None, for offline use) the last known
+    rate is returned even when stale. Safe to share between threads.
+    """
+
+    def __init__(self, provider=None, ttl=RATES_TTL, snapshot_path=RATES_SNAPSHOT_FILE,
+                 clock=time.time):
+        self.provider = provider
+        self.ttl = ttl
+        self.snapshot_path = snapshot_path
+        self.clock = clock
+        # Guards _cache and the snapshot file; held while neither fetching
+        self._lock = threading.Lock()
+        self._cache = self._load_snapshot()
+
+    def _load_snapshot(self):
+        if not self.snapshot_path or not os.path.exists(self.snapshot_path):
+            return {}
+        try:
+            with open(self.snapshot_path) as f:
+                data = json.load(f)
+            return {key: (float(entry['rate']), float(entry['fetched_at']))
+                    for key, entry in data.items()}
+        except (OSError, ValueError, KeyError, TypeError, AttributeError):
+            # A damaged snapshot only costs a refetch
+            return {}
+
+    def _save_snapshot(self):
+        if not self.snapshot_path:
+            return
+        data = {key: {'rate': rate, 'fetched_at': fetched_at}
+                for key, (rate, fetched_at) in self._cache.items()}
+        # Rates can be refetched, so skip the fsync
+        atomic_write_json(self.snapshot_path, data, fsync=False)
+
+    def rate(self, base, quote):
+        if base == quote:
+            return 1.0
+
+        key = pair_key(base, quote)
+        now = self.clock()
+        with self._lock:
+            cached = self._cache.get(key)
+        if cached and now - cached[1] < self.ttl:
+            return cached[0]
+
+        try:
+            if self.provider is None:
+                raise RateUnavailable(f"Offline and no rate for {base} to {quote}")
+            if hasattr(self.provider, 'rates'):
+                table = self.provider.rates(base)
+                if quote not in table:
+                    raise RateUnavailable(f"No rate for {base} to {quote}")
+            else:
+                table = {quote: self.provider.rate(base, quote)}
+        except RateUnavailable:
+            if cached:
+                return cached[0]
+            raise
+
+        with self._lock:
+            for table_quote, table_rate in table.items():
+                if table_quote != base:
+                    self._cache[pair_key(base, table_quote)] = (table_rate, now)
+            try:
+                self._save_snapshot()
+            except OSError:
+                pass
+        return table[quote]
+
+
+def convert_amounts(amounts, currencies, to_currency, provider):
+    """
+    Convert parallel lists of amounts and currency codes into to_currency.
+
+    Rows are grouped per currency pair so each rate is looked up once and
+    applied to the whole group. Returns (converted, rates) where rates maps
+    'FROM:TO' to the rate that was used.
+    """
+    groups = {}
+    for index, currency in enumerate(currencies):
+        groups.setdefault(currency or to_currency, []).append(index)
+
+    converted = [0.0] * len(amounts)
+    rates = {}
+    for currency, indices in groups.items():
+        rate = provider.rate(currency, to_currency)
+        rates[pair_key(currency, to_currency)] = rate
+        for index in indices:
+            converted[index] = amounts[index] * rate
+    return converted, rates
@@ -0,0 +1,233 @@
+"""
+Zakaat Reminders Module
+
+Reminder scheduling shared by the GUI and a headless reminder service.
+
+The service sleeps until the earliest next_date instead of polling, and
+wakes early on SIGHUP (sent by the app after reminders change). Run it as
+a plain process on Linux:
+
+    python reminders.py
+
+On Android it runs as the app's background service, declared in
+buildozer.spec as `services = Reminders:reminders.py`.
+"""
+import os
+import select
+import signal
+import socket
+import sys
+from datetime import datetime, timedelta
+
+from storage import DurableStore
+from validation import DATE_FORMAT, ValidationError, parse_date
+
+REMINDERS_FILE = 'zakaat_reminders.json'
+PID_FILE = 'zakaat_reminders.pid'
+
+# Days between reminders by type; Custom defaults to weekly
+REMINDER_INTERVALS = {
+    'Annual': 365,
+    'Monthly': 30,
+    'Custom': 7
+}
+
+# Longest single sleep. Monotonic waits do not advance while a device is
+# suspended, so a very long wait could wake up late.
+MAX_SLEEP = 24 * 60 * 60
+# Seconds before retrying after a failed check
+RETRY_DELAY = 5 * 60
+
+
+def next_reminder_date(reminder_type, from_date):
+    days = REMINDER_INTERVALS.get(reminder_type, REMINDER_INTERVALS['Custom'])
+    return from_date + timedelta(days=days)
+
+
+def reminder_message(reminder):
+    note = reminder.get('note', '')
+    return f"Zakaat Reminder: {note}" if note else "Zakaat Reminder"
+
+
+class LogSink:
+    """Prints notifications to stdout."""
+
+    def notify(self, title, message):
+        print(f"{title}: {message}", flush=True)
+
+
+class MemorySink:
+    """Collects notifications in a list, for tests."""
+
+    def __init__(self):
+        self.notifications = []
+
+    def notify(self, title, message):
+        self.notifications.append((title, message))
+
+
+class PlyerSink:
+    """Shows system notifications through plyer."""
+
+    def __init__(self):
+        from plyer import notification
+        self.notification = notification
+
+    def notify(self, title, message):
+        self.notification.notify(title=title, message=message, app_name='Zakaat Calculator')
+
+
+def default_sink():
+    try:
+        return PlyerSink()
+    except ImportError:
+        return LogSink()
+
+
+class ReminderService:
+    """
+    Delivers due reminders and advances their next_date.
+
+    Uses the same store as the app, without loading Kivy.
+    """
+
+    def __init__(self, sink, path=REMINDERS_FILE, clock=datetime.now):
+        self.sink = sink
+        self.path = path
+        self.clock = clock
+        self._stopped = False
+        # Socket pair the sleeping loop waits on; set while run_forever runs
+        self._wake_reader = None
+        self._wake_writer = None
+
+    def run_once(self):
+        """
+        Deliver reminders due today or earlier and return the seconds until
+        the next one is due, or None when there are no reminders.
+        """
+        now = self.clock()
+        today = now.strftime(DATE_FORMAT)
+        earliest = None
+
+        # The store stays locked until closed, so the app cannot change a
+        # reminder between reading and advancing it
+        with DurableStore(self.path) as store:
+            for key in store.keys():
+                reminder = store.get(key)
+                try:
+                    next_date = parse_date(reminder.get('next_date'))
+                except ValidationError:
+                    # Skip reminders the app could not have written
+                    continue
+
+                if reminder['next_date'] <= today:
+                    self.sink.notify('Zakaat Reminder', reminder_message(reminder))
+                    # Skip past any dates missed while the service was not running
+                    while next_date.strftime(DATE_FORMAT) <= today:
+                        next_date = next_reminder_date(reminder.get('type'), next_date)
+                    reminder['next_date'] = next_date.strftime(DATE_FORMAT)
+                    store.put(key, **reminder)
+
+                if earliest is None or next_date < earliest:
+                    earliest = next_date
+
+        if earliest is None:
+            return None
+        return max(0, (earliest - now).total_seconds())
+
+    def wake(self):
+        """
+        Wake the loop to check reminders now.
+
+        Safe to call from a signal handler: it writes to a socket instead of
+        taking a lock the interrupted loop may be holding.
+        """
+        writer = self._wake_writer
+        if writer is None:
+            # Not running; run_forever checks reminders when it starts
+            return
+        try:
+            writer.send(b'\0')
+        except OSError:
+            # A wake-up is already pending, or the loop has just exited
+            pass
+
+    def stop(self):
+        self._stopped = True
+        self.wake()
+
+    def _sleep(self, timeout):
+        readable, _, _ = select.select([self._wake_reader], [], [], timeout)
+        if readable:
+            try:
+                while self._wake_reader.recv(4096):
+                    pass
+            except BlockingIOError:
+                pass
+
+    def run_forever(self):
+        # A socket pair rather than a pipe, so select() works on Windows too
+        reader, writer = socket.socketpair()
+        reader.setblocking(False)
+        writer.setblocking(False)
+        self._wake_reader, self._wake_writer = reader, writer
+        try:
+            while not self._stopped:
+                try:
+                    delay = self.run_once()
+                except Exception as e:
+                    # A damaged store or a failing sink must not stop future reminders
+                    print(f"Reminder check failed: {e!r}", file=sys.stderr, flush=True)
+                    delay = RETRY_DELAY
+                # With nothing scheduled, sleep until woken
+                self._sleep(MAX_SLEEP if delay is None else min(delay, MAX_SLEEP))
+        finally:
+            self._wake_reader = self._wake_writer = None
+            reader.close()
+            writer.close()
+
+
+def notify_service(pid_file=PID_FILE):
+    """Ask a running desktop service to reload reminders."""
+    try:
+        with open(pid_file) as f:
+            os.kill(int(f.read().strip()), signal.SIGHUP)
+    except (OSError, ValueError, AttributeError):
+        # No service running, or no SIGHUP on this platform
+        pass
+
+
+def service_running(pid_file=PID_FILE):
+    """Return whether a desktop service with a live process wrote pid_file."""
+    if not hasattr(signal, 'SIGHUP'):
+        # Signal 0 is not a liveness check on Windows
+        return False
+    try:
+        with open(pid_file) as f:
+            os.kill(int(f.read().strip()), 0)
+    except PermissionError:
+        return True
+    except (OSError, ValueError):
+        return False
+    return True
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    path = argv[0] if argv else os.environ.get('ZAKAAT_REMINDERS', REMINDERS_FILE)
+    service = ReminderService(default_sink(), path)
+
+    if hasattr(signal, 'SIGHUP'):
+        signal.signal(signal.SIGHUP, lambda signum, frame: service.wake())
+    signal.signal(signal.SIGTERM, lambda signum, frame: service.stop())
+
+    with open(PID_FILE, 'w') as f:
+        f.write(str(os.getpid()))
+    try:
+        service.run_forever()
+    finally:
+        os.remove(PID_FILE)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,210 @@
+"""
+Zakaat Scenarios Module
+
+What-if analysis of gold/silver price changes and asset adjustments.
+
+Net assets are linear in the metal prices, so each household is reduced
+once to money, gold grams and silver grams; every grid cell then costs a
+few multiply-adds per household instead of a full recalculation.
+
+For a whole member base, run against a batch CSV:
+
+    python scenarios.py assets.csv scenarios.csv --gold=-20,0,20 --adjust debts=-1000,cash=-1000
+"""
+import argparse
+import csv
+import os
+import re
+import sys
+
+from batch import household_assets, read_rows, write_rejects
+from calculator import (NISAB_GOLD, NISAB_SILVER, ZAKAAT_RATE, GOLD_PRICE_PER_GRAM,
+                        SILVER_PRICE_PER_GRAM, METAL_PRICE_CURRENCY, MONETARY_FIELDS)
+from currency import (DEFAULT_CURRENCY, RATES_SNAPSHOT_FILE, CachedRateProvider,
+                      HttpRateProvider, RateUnavailable, pair_key)
+from validation import ASSET_IDS, ValidationError, parse_amount, parse_changes, validate_rows
+
+DEFAULT_CHANGES = [-0.2, 0.0, 0.2]
+OUTPUT_FIELDS = ['adjustment', 'gold_change', 'silver_change', 'nisab_threshold',
+                 'households_above_nisab', 'total_zakaat']
+
+
+def household_terms(assets):
+    """Split assets into (money, gold grams, silver grams), as calculate() sums them."""
+    money = sum(assets.get(asset_id, 0) for asset_id in MONETARY_FIELDS if asset_id != 'debts')
+    return money - assets.get('debts', 0), assets.get('gold', 0), assets.get('silver', 0)
+
+
+def calculation_inputs(calculation):
+    """
+    Return (assets, gold_price, silver_price) in the reporting currency of a
+    calculation record, using the rates stored with it.
+    """
+    currency = calculation['currency']
+    rates = calculation['rates']
+    assets = dict(calculation['assets'])
+    for asset_id, asset_currency in calculation['asset_currencies'].items():
+        assets[asset_id] *= rates[pair_key(asset_currency, currency)]
+    metal_rate = rates[pair_key(METAL_PRICE_CURRENCY, currency)]
+    return assets, GOLD_PRICE_PER_GRAM * metal_rate, SILVER_PRICE_PER_GRAM * metal_rate
+
+
+def evaluate(households, gold_price_per_gram=GOLD_PRICE_PER_GRAM,
+             silver_price_per_gram=SILVER_PRICE_PER_GRAM, gold_changes=DEFAULT_CHANGES,
+             silver_changes=DEFAULT_CHANGES, adjustments=None):
+    """
+    Evaluate every combination of price changes and asset adjustments.
+
+    households is a list of asset dicts in the same currency as the prices.
+    Changes are fractions of the base prices. adjustments is a list of
+    (name, {asset_id: delta}) pairs applied to every household; by default
+    only the current assets are evaluated.
+
+    Returns a dict with the axes and matrices indexed as
+    [adjustment][gold change][silver change], holding the Nisab threshold
+    per price pair and, per household, the Zakaat due and whether net
+    assets reach the Nisab.
+    """
+    adjustments = adjustments or [('Current', {})]
+    terms = [household_terms(assets) for assets in households]
+
+    zakaat_due = []
+    above_nisab = []
+    for _, deltas in adjustments:
+        delta_money, delta_gold, delta_silver = household_terms(deltas)
+        adjusted = [(money + delta_money, gold + delta_gold, silver + delta_silver)
+                    for money, gold, silver in terms]
+
+        due_rows = []
+        above_rows = []
+        for gold_change in gold_changes:
+            gold_price = gold_price_per_gram * (1 + gold_change)
+            due_row = []
+            above_row = []
+            for silver_change in silver_changes:
+                silver_price = silver_price_per_gram * (1 + silver_change)
+                nisab = min(NISAB_GOLD * gold_price, NISAB_SILVER * silver_price)
+                net = [money + gold * gold_price + silver * silver_price
+                       for money, gold, silver in adjusted]
+                above = [value >= nisab for value in net]
+                due_row.append([value * ZAKAAT_RATE if is_above else 0
+                                for value, is_above in zip(net, above)])
+                above_row.append(above)
+            due_rows.append(due_row)
+            above_rows.append(above_row)
+        zakaat_due.append(due_rows)
+        above_nisab.append(above_rows)
+
+    nisab = [[min(NISAB_GOLD * gold_price_per_gram * (1 + gold_change),
+                  NISAB_SILVER * silver_price_per_gram * (1 + silver_change))
+              for silver_change in silver_changes]
+             for gold_change in gold_changes]
+
+    return {
+        'adjustments': [name for name, _ in adjustments],
+        'gold_changes': list(gold_changes),
+        'silver_changes': list(silver_changes),
+        'nisab_threshold': nisab,
+        'zakaat_due': zakaat_due,
+        'above_nisab': above_nisab
+    }
+
+
+def totals(grid):
+    """Sum a grid over households into [adjustment][gold][silver] (total due, count above Nisab)."""
+    return [[[(sum(due), sum(above)) for due, above in zip(due_row, above_row)]
+             for due_row, above_row in zip(due_rows, above_rows)]
+            for due_rows, above_rows in zip(grid['zakaat_due'], grid['above_nisab'])]
+
+
+def format_change(change):
+    return f"{change * 100:+.0f}%"
+
+
+def parse_adjustment(text):
+    """
+    Parse FIELD=AMOUNT[,FIELD=AMOUNT...] into an adjustment pair, so one
+    scenario can change several assets (paying a debt from cash).
+    """
+    deltas = {}
+    # Split only before the next FIELD=, as amounts may contain ',' grouping
+    for part in re.split(r',(?=\s*\w+\s*=)', text):
+        asset_id, separator, amount = part.partition('=')
+        asset_id = asset_id.strip()
+        if asset_id not in ASSET_IDS:
+            raise ValidationError(f"Unknown asset '{asset_id}'")
+        # parse_amount reads an empty field as 0, which would add a no-op scenario
+        if not separator or not amount.strip():
+            raise ValidationError(f"Missing amount for '{asset_id}', expected {asset_id}=AMOUNT")
+        deltas[asset_id] = deltas.get(asset_id, 0) + parse_amount(amount, decimal='.',
+                                                                  allow_negative=True)
+    return text, deltas
+
+
+def write_totals(path, grid):
+    with open(path, 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=OUTPUT_FIELDS)
+        writer.writeheader()
+        for name, rows in zip(grid['adjustments'], totals(grid)):
+            for gold_change, row, nisab_row in zip(grid['gold_changes'], rows, grid['nisab_threshold']):
+                for silver_change, (due, above), nisab in zip(grid['silver_changes'], row, nisab_row):
+                    writer.writerow({
+                        'adjustment': name,
+                        'gold_change': format_change(gold_change),
+                        'silver_change': format_change(silver_change),
+                        'nisab_threshold': f"{nisab:.2f}",
+                        'households_above_nisab': above,
+                        'total_zakaat': f"{due:.2f}"
+                    })
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Run what-if scenarios over a CSV of household assets.')
+    parser.add_argument('input', help='CSV with household,asset,amount,currency columns')
+    parser.add_argument('output', help='CSV to write scenario totals to')
+    parser.add_argument('--gold', default='-20,0,20', help='Gold price changes in percent')
+    parser.add_argument('--silver', default='-20,0,20', help='Silver price changes in percent')
+    parser.add_argument('--adjust', action='append', default=[],
+                        help='Extra scenario adding AMOUNT to FIELD for every household, '
+                             'as FIELD=AMOUNT[,FIELD=AMOUNT...]')
+    parser.add_argument('--currency', default=DEFAULT_CURRENCY, help='Reporting currency')
+    parser.add_argument('--rates', default=RATES_SNAPSHOT_FILE, help='FX rate snapshot file')
+    parser.add_argument('--offline', action='store_true', help='Use only the rate snapshot')
+    parser.add_argument('--rejects', help='CSV for invalid rows (default: <output>.rejects.csv)')
+    args = parser.parse_args(argv)
+
+    try:
+        gold_changes = parse_changes(args.gold)
+        silver_changes = parse_changes(args.silver)
+        adjustments = [('Current', {})] + [parse_adjustment(text) for text in args.adjust]
+    except ValidationError as e:
+        parser.error(str(e))
+
+    rows, rejects = validate_rows(read_rows(args.input))
+    if rejects:
+        rejects_path = args.rejects or os.path.splitext(args.output)[0] + '.rejects.csv'
+        write_rejects(rejects_path, rejects)
+        print(f"{len(rejects)} invalid rows written to {rejects_path}", file=sys.stderr)
+
+    provider = CachedRateProvider(
+        None if args.offline else HttpRateProvider(),
+        snapshot_path=args.rates
+    )
+    try:
+        households, metal_rate, _ = household_assets(rows, provider, args.currency)
+    except RateUnavailable as e:
+        parser.exit(1, f"Error in calculation: {e}\n")
+
+    grid = evaluate(
+        list(households.values()),
+        gold_price_per_gram=GOLD_PRICE_PER_GRAM * metal_rate,
+        silver_price_per_gram=SILVER_PRICE_PER_GRAM * metal_rate,
+        gold_changes=gold_changes,
+        silver_changes=silver_changes,
+        adjustments=adjustments
+    )
+    write_totals(args.output, grid)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,252 @@
+"""
+Zakaat Storage Module
+
+Crash-safe JSON stores for history and reminders.
+
+Each change is appended to a journal next to the store file. When the
+store is opened the journal is replayed over the main file, and every
+CHECKPOINT_EVERY entries the data is checkpointed back into the main file
+by writing a temp file, fsyncing it and renaming it over the original. The
+main file keeps the JsonStore layout, so existing data loads as is.
+
+Durability levels:
+- full: fsync the journal on every write
+- group: fsync once per group of GROUP_SIZE writes, and on sync()/close()
+- none: never fsync; survives a crash of the app but not a power loss
+
+An open store holds an exclusive lock on a `.lock` file next to it, so
+the app and the reminder service never write the same store at once.
+Open stores briefly and close them.
+
+Run `python bench_storage.py` for saves/sec under each level.
+"""
+import json
+import os
+import tempfile
+
+try:
+    import fcntl
+except ImportError:
+    # Windows
+    fcntl = None
+    import msvcrt
+
+DURABILITY_LEVELS = ('full', 'group', 'none')
+GROUP_SIZE = 16
+CHECKPOINT_EVERY = 64
+
+# Places where a fault hook is called, so tests can simulate a crash
+FAULT_POINTS = ('journal-write', 'before-sync', 'before-rename', 'before-truncate')
+
+
+def _fsync_dir(path):
+    # Persist the rename itself; directories cannot be opened on Windows
+    if os.name != 'posix':
+        return
+    fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _lock(path):
+    """Open path and take an exclusive lock on it, waiting for other holders."""
+    f = open(path, 'a+b')
+    try:
+        if fcntl:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            f.seek(0)
+            msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+    except BaseException:
+        f.close()
+        raise
+    return f
+
+
+def atomic_write_json(path, data, fsync=True, fault=None):
+    """Replace path with data so readers see either the old or the new file."""
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix=os.path.basename(path) + '.', suffix='.tmp',
+                                    dir=directory)
+    try:
+        with os.fdopen(fd, 'w') as f:
+            json.dump(data, f)
+            f.flush()
+            if fsync:
+                os.fsync(f.fileno())
+        if fault:
+            fault('before-rename')
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    if fsync:
+        _fsync_dir(path)
+
+
+def store_exists(path):
+    return os.path.exists(path) or os.path.exists(path + '.journal')
+
+
+class DurableStore:
+    """
+    Key-value store with the JsonStore methods the app uses.
+
+    fault is an optional callable taking a fault point name, used by the
+    crash tests.
+    """
+
+    def __init__(self, path, durability='full', group_size=GROUP_SIZE,
+                 checkpoint_every=CHECKPOINT_EVERY, fault=None):
+        if durability not in DURABILITY_LEVELS:
+            raise ValueError(f"Unknown durability level: {durability}")
+        self.path = path
+        self.journal_path = path + '.journal'
+        self.durability = durability
+        self.group_size = group_size
+        self.checkpoint_every = checkpoint_every
+        self._fault = fault
+        self._journal = None
+        self._pending = 0
+
+        # Load under the lock, so changes made by another process are seen
+        self._lock_file = _lock(path + '.lock')
+        try:
+            self._data = self._load()
+            self._journal_entries = self._replay()
+        except BaseException:
+            self._unlock()
+            raise
+        # Journal bytes known to be on disk
+        self.synced_size = (os.path.getsize(self.journal_path)
+                            if os.path.exists(self.journal_path) else 0)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _load(self):
+        if not os.path.exists(self.path):
+            return {}
+        with open(self.path) as f:
+            return json.load(f)
+
+    def _replay(self):
+        if not os.path.exists(self.journal_path):
+            return 0
+
+        entries = 0
+        valid_size = 0
+        with open(self.journal_path, 'rb') as f:
+            for line in f:
+                if not line.endswith(b'\n'):
+                    break
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    break
+                self._apply(record)
+                entries += 1
+                valid_size += len(line)
+
+        # Drop a torn tail left by a crash mid-append
+        if valid_size < os.path.getsize(self.journal_path):
+            with open(self.journal_path, 'r+b') as f:
+                f.truncate(valid_size)
+        return entries
+
+    def _apply(self, record):
+        if record['op'] == 'put':
+            self._data[record['key']] = record['value']
+        else:
+            self._data.pop(record['key'], None)
+
+    def _append(self, record):
+        if self._fault:
+            self._fault('journal-write')
+        if self._journal is None:
+            created = not os.path.exists(self.journal_path)
+            self._journal = open(self.journal_path, 'ab')
+            # A new file's directory entry must be durable too
+            if created and self.durability != 'none':
+                _fsync_dir(self.journal_path)
+        self._journal.write((json.dumps(record) + '\n').encode('utf-8'))
+        self._journal.flush()
+        self._apply(record)
+        self._journal_entries += 1
+        self._pending += 1
+
+        if self.durability == 'full' or (self.durability == 'group' and
+                                         self._pending >= self.group_size):
+            self.sync()
+        if self._journal_entries >= self.checkpoint_every:
+            self.checkpoint()
+
+    def sync(self):
+        """Commit pending journal writes to disk."""
+        if self._journal is None or self.durability == 'none':
+            return
+        if self._fault:
+            self._fault('before-sync')
+        os.fsync(self._journal.fileno())
+        self._pending = 0
+        self.synced_size = self._journal.tell()
+
+    def checkpoint(self):
+        """Write all data into the main file and empty the journal."""
+        atomic_write_json(self.path, self._data, fsync=self.durability != 'none',
+                          fault=self._fault)
+        if self._fault:
+            self._fault('before-truncate')
+        # Replaying a stale journal is harmless, since entries hold whole values
+        if self._journal is not None:
+            self._journal.close()
+        self._journal = open(self.journal_path, 'wb')
+        self._journal_entries = 0
+        self._pending = 0
+        self.synced_size = 0
+
+    @property
+    def pending(self):
+        """Number of journal writes not yet fsynced."""
+        return self._pending
+
+    def _unlock(self):
+        if self._lock_file is not None:
+            # Closing the file releases the lock
+            self._lock_file.close()
+            self._lock_file = None
+
+    def close(self):
+        try:
+            if self._journal is not None:
+                self.sync()
+                self._journal.close()
+                self._journal = None
+        finally:
+            self._unlock()
+
+    def put(self, key, **values):
+        self._append({'op': 'put', 'key': key, 'value': values})
+
+    def get(self, key):
+        return dict(self._data[key])
+
+    def delete(self, key):
+        if key not in self._data:
+            raise KeyError(key)
+        self._append({'op': 'delete', 'key': key})
+
+    def exists(self, key):
+        return key in self._data
+
+    def keys(self):
+        return list(self._data.keys())
+
+    def count(self):
+        return len(self._data)
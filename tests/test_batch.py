@@ -0,0 +1,59 @@
+import csv
+
+import batch
+from currency import CachedRateProvider, FakeRateProvider
+
+ROWS = """household,asset,amount,currency
+smith,cash,1200,USD
+smith,bank_balance,5000,EUR
+smith,gold,20,
+smith,debts,300,GBP
+ali,cash,50,PKR
+bad,cash,abc,USD
+bad,jewels,5,USD
+"""
+
+
+def read_csv(path):
+    with open(path, newline='') as f:
+        return list(csv.DictReader(f))
+
+
+def test_batch_run_writes_results_and_rejects(tmp_path):
+    input_path = tmp_path / 'assets.csv'
+    input_path.write_text(ROWS)
+    output_path = tmp_path / 'results.csv'
+    rates_path = str(tmp_path / 'rates.json')
+
+    # Seed the snapshot so the offline run needs no network
+    seed = CachedRateProvider(FakeRateProvider(), snapshot_path=rates_path)
+    for currency in ('USD', 'EUR', 'GBP', 'PKR'):
+        seed.rate(currency, 'EUR')
+
+    batch.main([str(input_path), str(output_path), '--currency', 'EUR', '--offline',
+                '--rates', rates_path])
+
+    results = {row['household']: row for row in read_csv(output_path)}
+    assert set(results) == {'smith', 'ali'}
+    # 1200 USD + 5000 EUR + 20 g gold at 60 USD - 300 GBP, all in EUR
+    expected = 1200 * 0.92 + 5000 + 20 * 60 * 0.92 - 300 * 0.92 / 0.79
+    assert results['smith']['net_assets'] == f"{expected:.2f}"
+    assert results['smith']['zakaat_amount'] == f"{expected * 0.025:.2f}"
+    assert results['ali']['zakaat_amount'] == '0.00'
+
+    rejects = read_csv(tmp_path / 'results.rejects.csv')
+    assert [row['amount'] for row in rejects] == ['abc', '5']
+    assert rejects[0]['errors'] == 'amount: Not a valid amount'
+    assert rejects[1]['errors'] == "asset: Unknown asset 'jewels'"
+
+
+def test_no_reject_file_without_invalid_rows(tmp_path):
+    input_path = tmp_path / 'assets.csv'
+    input_path.write_text('household,asset,amount,currency\nsmith,cash,100,USD\n')
+    output_path = tmp_path / 'results.csv'
+
+    batch.main([str(input_path), str(output_path), '--offline',
+                '--rates', str(tmp_path / 'rates.json')])
+
+    assert read_csv(output_path)[0]['net_assets'] == '100.00'
+    assert not (tmp_path / 'results.rejects.csv').exists()
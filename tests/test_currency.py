@@ -0,0 +1,134 @@
+import json
+import threading
+
+import pytest
+
+from currency import (CachedRateProvider, FakeRateProvider, RateUnavailable, convert_amounts,
+                      pair_key)
+
+
+class Clock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class FailingProvider:
+    def rate(self, base, quote):
+        raise RateUnavailable('offline')
+
+
+class TableProvider:
+    def __init__(self, tables):
+        self.tables = tables
+        self.calls = 0
+
+    def rates(self, base):
+        self.calls += 1
+        return self.tables[base]
+
+
+def test_convert_amounts_looks_up_each_pair_once():
+    fake = FakeRateProvider()
+    amounts = [100, 200, 300, 400, 500]
+    currencies = ['EUR', 'USD', 'EUR', 'GBP', 'USD']
+
+    converted, rates = convert_amounts(amounts, currencies, 'USD', fake)
+
+    assert fake.calls == 3
+    assert set(rates) == {'EUR:USD', 'USD:USD', 'GBP:USD'}
+    assert converted[1] == 200
+    assert converted[0] == pytest.approx(100 / 0.92)
+    assert converted[2] == pytest.approx(300 / 0.92)
+
+
+def test_cached_provider_reuses_rate_within_ttl():
+    fake = FakeRateProvider()
+    clock = Clock()
+    provider = CachedRateProvider(fake, ttl=60, snapshot_path=None, clock=clock)
+
+    first = provider.rate('EUR', 'USD')
+    clock.now += 59
+    assert provider.rate('EUR', 'USD') == first
+    assert fake.calls == 1
+
+    clock.now += 1
+    provider.rate('EUR', 'USD')
+    assert fake.calls == 2
+
+
+def test_cached_provider_falls_back_to_stale_rate():
+    clock = Clock()
+    provider = CachedRateProvider(FakeRateProvider(), ttl=60, snapshot_path=None, clock=clock)
+    rate = provider.rate('EUR', 'USD')
+
+    provider.provider = FailingProvider()
+    clock.now += 3600
+    assert provider.rate('EUR', 'USD') == rate
+
+    with pytest.raises(RateUnavailable):
+        provider.rate('GBP', 'USD')
+
+
+def test_cached_provider_keeps_every_quote_of_a_table():
+    tables = {'USD': {'USD': 1.0, 'EUR': 0.9, 'GBP': 0.8}}
+    table_provider = TableProvider(tables)
+    provider = CachedRateProvider(table_provider, snapshot_path=None)
+
+    assert provider.rate('USD', 'EUR') == 0.9
+    assert provider.rate('USD', 'GBP') == 0.8
+    assert table_provider.calls == 1
+
+
+def test_snapshot_is_reloaded(tmp_path):
+    snapshot = str(tmp_path / 'rates.json')
+    clock = Clock()
+    fake = FakeRateProvider()
+    rate = CachedRateProvider(fake, ttl=60, snapshot_path=snapshot, clock=clock).rate('EUR', 'USD')
+
+    with open(snapshot) as f:
+        assert json.load(f)[pair_key('EUR', 'USD')]['rate'] == rate
+
+    # Fresh snapshot rates are used without asking the provider
+    reloaded_fake = FakeRateProvider()
+    reloaded = CachedRateProvider(reloaded_fake, ttl=60, snapshot_path=snapshot, clock=clock)
+    assert reloaded.rate('EUR', 'USD') == rate
+    assert reloaded_fake.calls == 0
+
+    # Offline, even a stale snapshot rate is used
+    clock.now += 3600
+    offline = CachedRateProvider(None, ttl=60, snapshot_path=snapshot, clock=clock)
+    assert offline.rate('EUR', 'USD') == rate
+
+
+def test_damaged_snapshot_is_ignored(tmp_path):
+    snapshot = tmp_path / 'rates.json'
+    snapshot.write_text('{not json')
+    provider = CachedRateProvider(FakeRateProvider(), snapshot_path=str(snapshot))
+    assert provider.rate('USD', 'EUR') == pytest.approx(0.92)
+
+
+def test_concurrent_lookups_share_the_cache(tmp_path):
+    quotes = {f"Q{index}": float(index + 1) for index in range(200)}
+    cached = CachedRateProvider(TableProvider({f"B{index}": quotes for index in range(8)}),
+                                snapshot_path=str(tmp_path / 'rates.json'))
+    errors = []
+
+    def lookup(base):
+        try:
+            for quote in quotes:
+                assert cached.rate(base, quote) == quotes[quote]
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=lookup, args=(f"B{index}",)) for index in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    with open(tmp_path / 'rates.json') as f:
+        assert len(json.load(f)) == 8 * 200
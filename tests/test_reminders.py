@@ -0,0 +1,149 @@
+import json
+import os
+import signal
+import threading
+from datetime import datetime
+
+import pytest
+
+import reminders
+from reminders import MemorySink, ReminderService, service_running
+from storage import DurableStore
+
+NOW = datetime(2026, 10, 19, 12)
+
+
+def make_service(tmp_path, reminders):
+    path = str(tmp_path / 'reminders.json')
+    with open(path, 'w') as f:
+        json.dump(reminders, f)
+    return ReminderService(MemorySink(), path, clock=lambda: NOW)
+
+
+def stored(path, key):
+    with DurableStore(path) as store:
+        return store.get(key)
+
+
+def test_due_reminder_is_delivered_and_advanced(tmp_path):
+    service = make_service(tmp_path, {
+        'r1': {'type': 'Monthly', 'next_date': '2026-10-19', 'note': 'Pay Zakaat'}
+    })
+
+    service.run_once()
+
+    assert service.sink.notifications == [('Zakaat Reminder', 'Zakaat Reminder: Pay Zakaat')]
+    assert stored(service.path, 'r1')['next_date'] == '2026-11-18'
+
+
+def test_missed_intervals_are_skipped(tmp_path):
+    service = make_service(tmp_path, {
+        'r1': {'type': 'Custom', 'next_date': '2026-09-01', 'note': ''}
+    })
+
+    service.run_once()
+
+    # Delivered once, then moved past every missed weekly date
+    assert service.sink.notifications == [('Zakaat Reminder', 'Zakaat Reminder')]
+    assert stored(service.path, 'r1')['next_date'] == '2026-10-20'
+
+
+def test_invalid_next_date_is_skipped(tmp_path):
+    service = make_service(tmp_path, {
+        'bad': {'type': 'Annual', 'next_date': 'someday', 'note': ''},
+        'r1': {'type': 'Annual', 'next_date': '2026-12-01', 'note': ''}
+    })
+
+    delay = service.run_once()
+
+    assert service.sink.notifications == []
+    assert stored(service.path, 'bad')['next_date'] == 'someday'
+    assert delay == (datetime(2026, 12, 1) - NOW).total_seconds()
+
+
+def test_delay_is_until_earliest_next_date(tmp_path):
+    service = make_service(tmp_path, {
+        'r1': {'type': 'Annual', 'next_date': '2026-12-01', 'note': ''},
+        'r2': {'type': 'Monthly', 'next_date': '2026-10-21', 'note': ''},
+        'r3': {'type': 'Monthly', 'next_date': '2026-10-19', 'note': ''}
+    })
+
+    delay = service.run_once()
+
+    # r3 is delivered and moves to 2026-11-18, leaving r2 as the earliest
+    assert delay == (datetime(2026, 10, 21) - NOW).total_seconds()
+
+
+def test_empty_store_returns_none(tmp_path):
+    service = ReminderService(MemorySink(), str(tmp_path / 'reminders.json'), clock=lambda: NOW)
+
+    assert service.run_once() is None
+    assert service.sink.notifications == []
+
+
+def test_failed_check_is_retried(tmp_path, monkeypatch):
+    monkeypatch.setattr(reminders, 'RETRY_DELAY', 0)
+    service = make_service(tmp_path, {
+        'r1': {'type': 'Monthly', 'next_date': '2026-10-19', 'note': ''}
+    })
+    failures = [OSError('notification service unavailable')]
+
+    def notify(title, message):
+        if failures:
+            raise failures.pop()
+        service.sink.notifications.append((title, message))
+        service.stop()
+    service.sink.notify = notify
+
+    thread = threading.Thread(target=service.run_forever)
+    thread.start()
+    thread.join(5)
+
+    assert not thread.is_alive()
+    assert service.sink.notifications == [('Zakaat Reminder', 'Zakaat Reminder')]
+    assert stored(service.path, 'r1')['next_date'] == '2026-11-18'
+
+
+@pytest.mark.skipif(not hasattr(signal, 'SIGHUP'), reason='needs SIGHUP')
+def test_sighup_wakes_sleeping_service(tmp_path):
+    service = make_service(tmp_path, {
+        'r1': {'type': 'Annual', 'next_date': '2026-12-01', 'note': ''}
+    })
+    checks = threading.Semaphore(0)
+    run_once = service.run_once
+
+    def counted_run_once():
+        delay = run_once()
+        checks.release()
+        return delay
+    service.run_once = counted_run_once
+
+    woken = []
+
+    def signal_then_stop():
+        try:
+            if checks.acquire(timeout=5):
+                os.kill(os.getpid(), signal.SIGHUP)
+                # The service checks again long before the reminder is due
+                woken.append(checks.acquire(timeout=5))
+        finally:
+            service.stop()
+
+    previous = signal.signal(signal.SIGHUP, lambda signum, frame: service.wake())
+    controller = threading.Thread(target=signal_then_stop)
+    controller.start()
+    try:
+        service.run_forever()
+    finally:
+        signal.signal(signal.SIGHUP, previous)
+    controller.join(5)
+
+    assert woken == [True]
+
+
+def test_service_running_checks_pid_file(tmp_path):
+    pid_file = tmp_path / 'reminders.pid'
+    assert not service_running(str(pid_file))
+
+    pid_file.write_text(str(os.getpid()))
+    assert service_running(str(pid_file))
@@ -0,0 +1,174 @@
+import csv
+import random
+
+import pytest
+
+import scenarios
+from calculator import GOLD_PRICE_PER_GRAM, SILVER_PRICE_PER_GRAM, calculate
+from currency import CachedRateProvider, FakeRateProvider
+from scenarios import calculation_inputs, evaluate, parse_adjustment, totals
+from validation import ValidationError
+
+GOLD_CHANGES = [-0.3, -0.1, 0.0, 0.25]
+SILVER_CHANGES = [-0.5, 0.0, 0.4]
+ADJUSTMENTS = [
+    ('Current', {}),
+    ('Pay off debt', {'debts': -1000, 'cash': -1000}),
+    ('Sell gold', {'gold': -10, 'bank_balance': 600}),
+    ('More silver', {'silver': 500}),
+]
+
+ROWS = """household,asset,amount,currency
+smith,cash,1200,USD
+smith,bank_balance,5000,EUR
+smith,gold,20,
+smith,debts,300,GBP
+ali,cash,50,PKR
+bad,cash,abc,USD
+"""
+
+
+def random_households(count, seed=1):
+    rng = random.Random(seed)
+    return [{
+        'cash': rng.uniform(0, 5000),
+        'bank_balance': rng.uniform(0, 20000),
+        'gold': rng.uniform(0, 150),
+        'silver': rng.uniform(0, 1000),
+        'investments': rng.uniform(0, 5000),
+        'debts': rng.uniform(0, 8000),
+    } for _ in range(count)]
+
+
+def adjusted(assets, deltas):
+    result = dict(assets)
+    for asset_id, delta in deltas.items():
+        result[asset_id] = result.get(asset_id, 0) + delta
+    return result
+
+
+def read_csv(path):
+    with open(path, newline='') as f:
+        return list(csv.DictReader(f))
+
+
+def test_evaluate_matches_calculate():
+    households = random_households(50)
+
+    grid = evaluate(households, gold_changes=GOLD_CHANGES, silver_changes=SILVER_CHANGES,
+                    adjustments=ADJUSTMENTS)
+
+    assert grid['adjustments'] == [name for name, _ in ADJUSTMENTS]
+    for a, (_, deltas) in enumerate(ADJUSTMENTS):
+        for g, gold_change in enumerate(GOLD_CHANGES):
+            for s, silver_change in enumerate(SILVER_CHANGES):
+                gold_price = GOLD_PRICE_PER_GRAM * (1 + gold_change)
+                silver_price = SILVER_PRICE_PER_GRAM * (1 + silver_change)
+                for h, assets in enumerate(households):
+                    expected = calculate(adjusted(assets, deltas), gold_price, silver_price)
+                    assert grid['zakaat_due'][a][g][s][h] == pytest.approx(expected['zakaat_amount'])
+                    assert grid['above_nisab'][a][g][s][h] == (
+                        expected['net_assets'] >= expected['nisab_threshold'])
+                assert grid['nisab_threshold'][g][s] == pytest.approx(expected['nisab_threshold'])
+
+
+def test_totals_sum_over_households():
+    grid = evaluate(random_households(20), gold_changes=GOLD_CHANGES,
+                    silver_changes=SILVER_CHANGES, adjustments=ADJUSTMENTS)
+
+    grid_totals = totals(grid)
+
+    assert len(grid_totals) == len(ADJUSTMENTS)
+    for a in range(len(ADJUSTMENTS)):
+        for g in range(len(GOLD_CHANGES)):
+            for s in range(len(SILVER_CHANGES)):
+                due, above = grid_totals[a][g][s]
+                assert due == pytest.approx(sum(grid['zakaat_due'][a][g][s]))
+                assert above == sum(grid['above_nisab'][a][g][s])
+
+
+def test_calculation_inputs_use_stored_rates():
+    calculation = {
+        'currency': 'EUR',
+        'assets': {'cash': 100, 'bank_balance': 200, 'gold': 5},
+        'asset_currencies': {'cash': 'USD', 'bank_balance': 'EUR'},
+        'rates': {'USD:EUR': 0.9, 'EUR:EUR': 1.0},
+    }
+
+    assets, gold_price, silver_price = calculation_inputs(calculation)
+
+    assert assets == {'cash': pytest.approx(90), 'bank_balance': 200, 'gold': 5}
+    assert gold_price == pytest.approx(GOLD_PRICE_PER_GRAM * 0.9)
+    assert silver_price == pytest.approx(SILVER_PRICE_PER_GRAM * 0.9)
+
+
+def test_cli_writes_totals_and_rejects(tmp_path):
+    input_path = tmp_path / 'assets.csv'
+    input_path.write_text(ROWS)
+    output_path = tmp_path / 'scenarios.csv'
+    rates_path = str(tmp_path / 'rates.json')
+
+    # Seed the snapshot so the offline run needs no network
+    seed = CachedRateProvider(FakeRateProvider(), snapshot_path=rates_path)
+    for currency in ('USD', 'EUR', 'GBP', 'PKR'):
+        seed.rate(currency, 'EUR')
+
+    scenarios.main([str(input_path), str(output_path), '--currency', 'EUR', '--offline',
+                    '--rates', rates_path, '--gold=-50,0', '--silver=0',
+                    '--adjust', 'cash=-1000'])
+
+    rows = read_csv(output_path)
+    assert [(row['adjustment'], row['gold_change'], row['silver_change']) for row in rows] == [
+        ('Current', '-50%', '+0%'),
+        ('Current', '+0%', '+0%'),
+        ('cash=-1000', '-50%', '+0%'),
+        ('cash=-1000', '+0%', '+0%'),
+    ]
+    # 1200 USD + 5000 EUR + 20 g gold at 60 USD - 300 GBP, all in EUR
+    smith = 1200 * 0.92 + 5000 + 20 * 60 * 0.92 - 300 * 0.92 / 0.79
+    assert rows[1]['households_above_nisab'] == '1'
+    assert rows[1]['total_zakaat'] == f"{smith * 0.025:.2f}"
+    assert rows[1]['nisab_threshold'] == f"{612.36 * 0.8 * 0.92:.2f}"
+    # A gold price drop lowers smith's gold but not the silver Nisab
+    assert rows[0]['total_zakaat'] == f"{(smith - 10 * 60 * 0.92) * 0.025:.2f}"
+    # Both households spend 1000 EUR of cash; ali drops further below Nisab
+    assert rows[3]['total_zakaat'] == f"{(smith - 1000) * 0.025:.2f}"
+
+    rejects = read_csv(tmp_path / 'scenarios.rejects.csv')
+    assert [row['household'] for row in rejects] == ['bad']
+    assert rejects[0]['errors'] == 'amount: Not a valid amount'
+
+
+@pytest.mark.parametrize('text', ['debts', 'debts=', 'debts= ', 'jewels=5'])
+def test_parse_adjustment_rejects_missing_amount_or_asset(text):
+    with pytest.raises(ValidationError):
+        parse_adjustment(text)
+
+
+def test_cli_rejects_adjustment_without_amount(tmp_path, capsys):
+    with pytest.raises(SystemExit) as exit_info:
+        scenarios.main([str(tmp_path / 'assets.csv'), str(tmp_path / 'out.csv'),
+                        '--adjust=debts='])
+
+    assert exit_info.value.code == 2
+    assert "Missing amount for 'debts'" in capsys.readouterr().err
+    assert not (tmp_path / 'out.csv').exists()
+
+
+def test_parse_adjustment_changes_several_assets():
+    assert parse_adjustment('debts=-1,000,cash=-1,000') == (
+        'debts=-1,000,cash=-1,000', {'debts': -1000.0, 'cash': -1000.0})
+    assert parse_adjustment('cash=-5, cash=-5')[1] == {'cash': -10.0}
+
+
+def test_paying_off_debt_leaves_zakaat_unchanged():
+    households = random_households(20)
+    _, deltas = parse_adjustment('debts=-1000,cash=-1000')
+
+    grid = evaluate(households, adjustments=[('Current', {}), ('Pay off debt', deltas)])
+
+    current, paid_off = totals(grid)
+    for current_row, paid_off_row in zip(current, paid_off):
+        for (current_due, current_above), (due, above) in zip(current_row, paid_off_row):
+            assert due == pytest.approx(current_due)
+            assert above == current_above
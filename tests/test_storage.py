@@ -0,0 +1,171 @@
+import gc
+import json
+import os
+import threading
+
+import pytest
+
+from storage import DURABILITY_LEVELS, FAULT_POINTS, DurableStore, atomic_write_json
+
+WRITES = 20
+TORN_LINE = b'{"op": "put", "ke'
+
+
+class SimulatedCrash(Exception):
+    pass
+
+
+def crash_on(point, crash_at):
+    """Return a fault hook that crashes the crash_at-th time point is reached."""
+    hits = [0]
+
+    def fault(name):
+        if name == point:
+            hits[0] += 1
+            if hits[0] == crash_at:
+                raise SimulatedCrash(name)
+    return fault
+
+
+def run_until_crash(path, durability, fault):
+    """
+    Write until the fault hook crashes the store.
+
+    Returns (attempts, acknowledged, synced, synced_size): every value
+    written per key, the writes that returned, the writes known to be on
+    disk, and the journal bytes known to be on disk.
+    """
+    store = DurableStore(path, durability, group_size=4, checkpoint_every=8, fault=fault)
+    attempts = {}
+    acknowledged = {}
+    synced = {}
+    try:
+        for i in range(WRITES):
+            key = f"key_{i % 7}"
+            attempts.setdefault(key, []).append(i)
+            store.put(key, value=i)
+            acknowledged[key] = i
+            if store.pending == 0:
+                synced = dict(acknowledged)
+    except SimulatedCrash:
+        pass
+    synced_size = store.synced_size
+    # The process dies without closing the store
+    del store
+    gc.collect()
+    return attempts, acknowledged, synced, synced_size
+
+
+def reopen_with_torn_tail(path):
+    with open(path + '.journal', 'ab') as f:
+        f.write(TORN_LINE)
+    with DurableStore(path) as store:
+        return {key: store.get(key)['value'] for key in store.keys()}
+
+
+def assert_survived(data, expected, attempts):
+    # A write that crashed before returning may still have reached the disk
+    for key, value in expected.items():
+        allowed = attempts[key][attempts[key].index(value):]
+        assert data.get(key) in allowed, f"{key} is {data.get(key)}, expected one of {allowed}"
+
+
+@pytest.mark.filterwarnings('ignore::ResourceWarning')
+@pytest.mark.parametrize('point', FAULT_POINTS)
+@pytest.mark.parametrize('durability', DURABILITY_LEVELS)
+def test_acknowledged_writes_survive_crash(tmp_path, durability, point):
+    for crash_at in range(1, WRITES + 1):
+        path = str(tmp_path / f"crash-{crash_at}.json")
+        attempts, acknowledged, _, _ = run_until_crash(path, durability, crash_on(point, crash_at))
+
+        assert_survived(reopen_with_torn_tail(path), acknowledged, attempts)
+
+
+@pytest.mark.filterwarnings('ignore::ResourceWarning')
+@pytest.mark.parametrize('point', FAULT_POINTS)
+@pytest.mark.parametrize('durability', ['full', 'group'])
+def test_synced_writes_survive_power_loss(tmp_path, durability, point):
+    for crash_at in range(1, WRITES + 1):
+        path = str(tmp_path / f"power-{crash_at}.json")
+        attempts, _, synced, synced_size = run_until_crash(path, durability,
+                                                           crash_on(point, crash_at))
+
+        # Journal bytes that were never fsynced are lost
+        if os.path.exists(path + '.journal'):
+            with open(path + '.journal', 'r+b') as f:
+                f.truncate(synced_size)
+
+        assert_survived(reopen_with_torn_tail(path), synced, attempts)
+
+
+def test_full_durability_syncs_every_write(tmp_path):
+    with DurableStore(str(tmp_path / 'store.json'), 'full') as store:
+        store.put('a', value=1)
+        assert store.pending == 0
+
+
+def test_group_durability_syncs_per_group_and_on_close(tmp_path):
+    path = str(tmp_path / 'store.json')
+    store = DurableStore(path, 'group', group_size=3)
+    store.put('a', value=1)
+    store.put('b', value=2)
+    assert store.pending == 2
+    store.put('c', value=3)
+    assert store.pending == 0
+
+    store.put('d', value=4)
+    store.close()
+    assert store.synced_size == os.path.getsize(path + '.journal')
+
+
+def test_checkpoint_keeps_jsonstore_layout(tmp_path):
+    path = str(tmp_path / 'store.json')
+    with DurableStore(path, checkpoint_every=2) as store:
+        store.put('calc_1', net_assets=100)
+        store.put('calc_2', net_assets=200)
+        store.delete('calc_1')
+
+    with open(path) as f:
+        assert json.load(f) == {'calc_1': {'net_assets': 100}, 'calc_2': {'net_assets': 200}}
+    with DurableStore(path) as store:
+        assert store.keys() == ['calc_2']
+
+
+def test_atomic_write_keeps_old_file_on_failure(tmp_path):
+    path = str(tmp_path / 'data.json')
+    atomic_write_json(path, {'a': 1})
+
+    def fault(name):
+        raise SimulatedCrash(name)
+
+    with pytest.raises(SimulatedCrash):
+        atomic_write_json(path, {'a': 2}, fault=fault)
+
+    with open(path) as f:
+        assert json.load(f) == {'a': 1}
+    assert os.listdir(tmp_path) == ['data.json']
+
+
+def test_open_store_locks_out_other_writers(tmp_path):
+    path = str(tmp_path / 'store.json')
+    opened = threading.Event()
+    seen = []
+
+    def other_writer():
+        with DurableStore(path) as store:
+            opened.set()
+            seen.append(store.exists('a'))
+            store.delete('a')
+
+    with DurableStore(path) as store:
+        store.put('a', value=1)
+        thread = threading.Thread(target=other_writer)
+        thread.start()
+        # The other writer waits for the lock instead of loading stale data
+        assert not opened.wait(0.2)
+        store.checkpoint()
+    thread.join(5)
+
+    assert seen == [True]
+    with DurableStore(path) as store:
+        assert store.keys() == []
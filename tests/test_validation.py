@@ -0,0 +1,85 @@
+import locale
+
+import pytest
+
+from validation import (ValidationError, parse_amount, parse_changes, parse_date,
+                        validate_rows)
+
+
+@pytest.fixture
+def c_locale():
+    previous = locale.setlocale(locale.LC_NUMERIC)
+    locale.setlocale(locale.LC_NUMERIC, 'C')
+    yield
+    locale.setlocale(locale.LC_NUMERIC, previous)
+
+
+@pytest.mark.parametrize('text, decimal, expected', [
+    ('', '.', 0.0),
+    ('1,234.56', '.', 1234.56),
+    ('1,234,567.89', '.', 1234567.89),
+    ('1.234.567', ',', 1234567.0),
+    ('1.234,56', '.', 1234.56),
+    ('1 234,5', '.', 1234.5),
+    ('12,5', '.', 12.5),
+    ('1,234', '.', 1234.0),
+    ('1.234', '.', 1.234),
+    ('1.234', ',', 1234.0),
+    ('1,234', ',', 1.234),
+    ('.5', '.', 0.5),
+])
+def test_parse_amount_separators(text, decimal, expected):
+    assert parse_amount(text, decimal=decimal) == expected
+
+
+@pytest.mark.parametrize('text', ['1.234', '1,234'])
+def test_parse_amount_rejects_ambiguous_without_locale(c_locale, text):
+    with pytest.raises(ValidationError, match='Ambiguous'):
+        parse_amount(text)
+
+
+def test_parse_amount_without_locale_reads_unambiguous_amounts(c_locale):
+    assert parse_amount('12,5') == 12.5
+    assert parse_amount('1,234.5') == 1234.5
+
+
+@pytest.mark.parametrize('text, decimal', [
+    ('abc', '.'), ('1e3', '.'), ('inf', '.'), ('1.2.3x', '.'),
+    # Malformed digit grouping
+    ('1,234,5', '.'), ('1,2,3', '.'), ('12,34,567', '.'), (',234', '.'), ('1234,567.5', '.'),
+    ('1.234.5', ','), ('1.2.3', ','),
+])
+def test_parse_amount_rejects_invalid(text, decimal):
+    with pytest.raises(ValidationError, match='Not a valid amount'):
+        parse_amount(text, decimal=decimal)
+
+
+def test_parse_amount_negatives():
+    with pytest.raises(ValidationError, match='negative'):
+        parse_amount('-5', decimal='.')
+    assert parse_amount('(5)', decimal='.', allow_negative=True) == -5
+
+
+def test_parse_date():
+    assert parse_date('2026-10-19').day == 19
+    assert parse_date('', default='today') == 'today'
+    with pytest.raises(ValidationError):
+        parse_date('19/10/2026')
+
+
+def test_parse_changes_sorts_and_dedupes():
+    assert parse_changes('20, -20, 0, +20%') == [-0.2, 0.0, 0.2]
+    with pytest.raises(ValidationError):
+        parse_changes('-100')
+
+
+@pytest.mark.parametrize('text', ['1200', '12.50', '1,234.50', '1e3', '1_000', ' 12 ', 'nan', '-5'])
+def test_validate_rows_agrees_with_parse_amount(text):
+    valid, rejects = validate_rows([{'household': 'h', 'asset': 'cash', 'amount': text,
+                                     'currency': 'USD'}])
+    try:
+        expected = parse_amount(text, decimal='.')
+    except ValidationError:
+        assert not valid and 'amount' in rejects[0][1]
+    else:
+        assert valid[0]['amount'] == expected
@@ -0,0 +1,209 @@
+"""
+Zakaat Validation Module
+
+Parses form fields and batch rows into typed values, reporting per-field
+errors instead of falling back to defaults. Shared by the GUI, the batch
+runner and the reminder service.
+"""
+import locale
+import re
+from datetime import datetime
+
+from calculator import ASSET_FIELDS
+from currency import CURRENCIES
+
+DATE_FORMAT = '%Y-%m-%d'
+ASSET_IDS = {asset_id for asset_id, _ in ASSET_FIELDS}
+
+# Characters an amount field may contain
+AMOUNT_CHARS = set('0123456789.,-() \'')
+# Digit grouping characters other than '.' and ','
+GROUPING_CHARS = (' ', '\u00a0', '\u202f', "'", '_')
+AMOUNT_PATTERN = re.compile(r'\d+(\.\d*)?|\.\d+')
+# Amounts that float() and parse_amount read the same way
+PLAIN_AMOUNT_PATTERN = re.compile(r'\d+(\.\d+)?')
+
+
+class ValidationError(ValueError):
+    """Raised when a field cannot be parsed."""
+
+
+def locale_decimal_point():
+    """Return the LC_NUMERIC decimal separator, or None if no locale is set."""
+    if locale.setlocale(locale.LC_NUMERIC) in ('C', 'POSIX'):
+        return None
+    return locale.localeconv()['decimal_point']
+
+
+def parse_amount(text, decimal=None, allow_negative=False):
+    """
+    Parse a money or weight amount, returning 0.0 for an empty field.
+
+    Accepts '.' or ',' as decimal separator. When both appear the last one
+    is the decimal separator; otherwise decimal (the locale's by default)
+    decides, except that a single other separator not followed by exactly
+    three digits is read as decimal too ('12,5'). Without a decimal or a
+    locale, a single separator followed by three digits ('1.234') is
+    ambiguous and rejected. Grouping separators must split the integer part
+    into threes ('1,234,567'). Negatives may be written as '-10' or '(10)'.
+    """
+    text = (text or '').strip()
+    if not text:
+        return 0.0
+
+    negative = False
+    if text.startswith('(') and text.endswith(')'):
+        negative = True
+        text = text[1:-1].strip()
+    elif text.startswith('-'):
+        negative = True
+        text = text[1:].strip()
+
+    for char in GROUPING_CHARS:
+        text = text.replace(char, '')
+
+    decimal = decimal or locale_decimal_point()
+    if decimal not in ('.', ','):
+        separators = [char for char in text if char in '.,']
+        if len(separators) == 1 and len(text.rpartition(separators[0])[2]) == 3:
+            raise ValidationError('Ambiguous amount: leave out the thousands separator')
+        decimal = '.'
+    other = ',' if decimal == '.' else '.'
+
+    if ',' in text and '.' in text:
+        decimal = max(('.', ','), key=text.rfind)
+        grouping = ',' if decimal == '.' else '.'
+    elif text.count(other) == 1 and len(text.rpartition(other)[2]) != 3:
+        decimal, grouping = other, None
+    else:
+        grouping = other
+
+    if grouping and grouping in text:
+        # Only strip separators that group the integer part in threes
+        integer = text.partition(decimal)[0]
+        if not re.fullmatch(r'\d{1,3}(%s\d{3})*' % re.escape(grouping), integer):
+            raise ValidationError('Not a valid amount')
+        text = text.replace(grouping, '')
+    text = text.replace(decimal, '.')
+
+    if not AMOUNT_PATTERN.fullmatch(text):
+        raise ValidationError('Not a valid amount')
+    value = float(text)
+    if negative:
+        if not allow_negative:
+            raise ValidationError('Amount cannot be negative')
+        value = -value
+    return value
+
+
+def parse_date(text, default=None):
+    """Parse a YYYY-MM-DD date, returning default for an empty field."""
+    text = (text or '').strip()
+    if not text and default is not None:
+        return default
+    try:
+        return datetime.strptime(text, DATE_FORMAT)
+    except ValueError:
+        raise ValidationError('Date must be in YYYY-MM-DD format')
+
+
+def parse_currency(text, default=None):
+    text = (text or '').strip().upper()
+    if not text and default is not None:
+        return default
+    if text not in CURRENCIES:
+        raise ValidationError(f"Unsupported currency '{text}'")
+    return text
+
+
+def parse_changes(text):
+    """Parse percent changes such as '-20, 0, 20' into sorted, distinct fractions."""
+    parts = [part for part in re.split(r'[,;\s]+', (text or '').strip()) if part]
+    if not parts:
+        raise ValidationError('Enter at least one percent change')
+    changes = []
+    for part in parts:
+        value = parse_amount(part.rstrip('%').lstrip('+'), decimal='.', allow_negative=True)
+        if value <= -100:
+            raise ValidationError('A price cannot fall by 100% or more')
+        changes.append(value / 100)
+    return sorted(set(changes))
+
+
+class FormState:
+    """
+    Typed values and errors for a form.
+
+    Fields are parsed when their text changes and the result is kept, so
+    reading the values again does not reparse anything.
+    """
+
+    def __init__(self, parsers):
+        self.parsers = parsers
+        self.values = {}
+        self.errors = {}
+        self._texts = {}
+
+    def update(self, field, text):
+        if field in self._texts and self._texts[field] == text:
+            return
+        self._texts[field] = text
+        try:
+            self.values[field] = self.parsers[field](text)
+            self.errors.pop(field, None)
+        except ValidationError as e:
+            self.values.pop(field, None)
+            self.errors[field] = str(e)
+
+    def is_valid(self):
+        return not self.errors
+
+
+def asset_form_state():
+    return FormState({asset_id: parse_amount for asset_id in ASSET_IDS})
+
+
+def validate_rows(rows):
+    """
+    Validate batch rows in one pass.
+
+    Plain amounts such as '1200' or '12.50' go through float() directly;
+    anything else is parsed with parse_amount, so rows accept exactly what
+    the form does. Returns (valid, rejects) where valid rows
+    have a float amount and a currency code, and rejects are
+    (row, errors) pairs.
+    """
+    valid = []
+    rejects = []
+    for row in rows:
+        errors = {}
+        text = row.get('amount') or ''
+        if PLAIN_AMOUNT_PATTERN.fullmatch(text):
+            amount = float(text)
+        else:
+            try:
+                amount = parse_amount(text, decimal='.')
+            except ValidationError as e:
+                errors['amount'] = str(e)
+
+        if not row.get('household'):
+            errors['household'] = 'Household is required'
+        if row.get('asset') not in ASSET_IDS:
+            errors['asset'] = f"Unknown asset '{row.get('asset')}'"
+        currency = row.get('currency') or ''
+        if currency and currency not in CURRENCIES:
+            try:
+                currency = parse_currency(currency)
+            except ValidationError as e:
+                errors['currency'] = str(e)
+
+        if errors:
+            rejects.append((row, errors))
+        else:
+            valid.append({
+                'household': row['household'],
+                'asset': row['asset'],
+                'amount': amount,
+                'currency': currency
+            })
+    return valid, rejects
@@ -12,16 +12,47 @@ from kivy.uix.button import Button
 from kivy.uix.spinner import Spinner
 from kivy.uix.popup import Popup
 from kivy.uix.screenmanager import ScreenManager, Screen
-from kivy.storage.jsonstore import JsonStore
-from kivy.clock import Clock
+from kivy.uix.widget import Widget
+from kivy.graphics import Color, Line
+from kivy.clock import Clock, mainthread
 from kivy.utils import platform
-from datetime import datetime, timedelta
-import os
+from datetime import datetime
+import locale
+import threading
 
-# Constants
-NISAB_GOLD = 87.48  # Nisab threshold in grams of gold
-NISAB_SILVER = 612.36  # Nisab threshold in grams of silver
-ZAKAAT_RATE = 0.025  # 2.5%
+from calculator import (ASSET_FIELDS, METAL_FIELDS, MONETARY_FIELDS, GOLD_PRICE_PER_GRAM,
+                        SILVER_PRICE_PER_GRAM, METAL_PRICE_CURRENCY, calculate)
+from currency import (CURRENCIES, DEFAULT_CURRENCY, CachedRateProvider, HttpRateProvider,
+                      RateUnavailable, convert_amounts, format_amount, pair_key)
+from reminders import ReminderService, next_reminder_date, notify_service, service_running
+from scenarios import calculation_inputs, evaluate, format_change, totals
+from storage import DurableStore, store_exists
+from validation import (AMOUNT_CHARS, ValidationError, asset_form_state, parse_amount,
+                        parse_changes, parse_date)
+
+# Line colors for scenario charts
+CHART_COLORS = [
+    (0.2, 0.6, 1.0),
+    (1.0, 0.5, 0.2),
+    (0.3, 0.8, 0.3),
+    (0.9, 0.3, 0.6),
+    (0.8, 0.8, 0.2),
+    (0.6, 0.4, 1.0)
+]
+
+# Matches `services = Reminders:reminders.py` in buildozer.spec
+ANDROID_SERVICE_NAME = 'Reminders'
+
+class PopupSink:
+    """Shows reminder notifications as in-app popups."""
+    
+    def notify(self, title, message):
+        popup = Popup(
+            title=title,
+            content=Label(text=message),
+            size_hint=(0.8, 0.3)
+        )
+        popup.open()
 
 class HomeScreen(Screen):
     def __init__(self, **kwargs):
@@ -71,6 +102,14 @@ class HomeScreen(Screen):
         layout.add_widget(history_button)
         layout.add_widget(reminder_button)
         
+        scenarios_button = Button(
+            text='What-If Scenarios',
+            size_hint_y=None,
+            height=50
+        )
+        scenarios_button.bind(on_press=self.go_to_scenarios)
+        layout.add_widget(scenarios_button)
+        
         self.add_widget(layout)
     
     def go_to_calculator(self, instance):
@@ -84,11 +123,18 @@ class HomeScreen(Screen):
     
     def go_to_reminders(self, instance):
         self.manager.current = 'reminders'
+    
+    def go_to_scenarios(self, instance):
+        self.manager.current = 'scenarios'
 
 class CalculatorScreen(Screen):
     def __init__(self, **kwargs):
         super(CalculatorScreen, self).__init__(**kwargs)
         self.asset_inputs = {}
+        self.currency_inputs = {}
+        self.form = asset_form_state()
+        self.calculation_id = 0
+        self.rate_provider = CachedRateProvider(HttpRateProvider())
         
         main_layout = BoxLayout(orientation='vertical', padding=10, spacing=10)
         
@@ -107,32 +153,43 @@ class CalculatorScreen(Screen):
         form_layout = BoxLayout(orientation='vertical', spacing=10, size_hint_y=None)
         form_layout.bind(minimum_height=form_layout.setter('height'))
         
+        # Reporting currency
+        currency_layout = BoxLayout(size_hint_y=None, height=50)
+        currency_label = Label(text='Report in', size_hint_x=0.4)
+        self.reporting_currency = Spinner(
+            text=DEFAULT_CURRENCY,
+            values=CURRENCIES,
+            size_hint_x=0.6
+        )
+        currency_layout.add_widget(currency_label)
+        currency_layout.add_widget(self.reporting_currency)
+        form_layout.add_widget(currency_layout)
+        
         # Asset inputs
-        assets = [
-            ('cash', 'Cash on Hand'),
-            ('bank_balance', 'Bank Balance'),
-            ('gold', 'Gold (grams)'),
-            ('silver', 'Silver (grams)'),
-            ('investments', 'Investments'),
-            ('business_assets', 'Business Assets'),
-            ('rental_income', 'Rental Income'),
-            ('other_assets', 'Other Assets'),
-            ('debts', 'Debts (to be subtracted)')
-        ]
-        
-        for asset_id, asset_name in assets:
+        for asset_id, asset_name in ASSET_FIELDS:
             asset_layout = BoxLayout(size_hint_y=None, height=50)
             asset_label = Label(text=asset_name, size_hint_x=0.4)
             asset_input = TextInput(
                 hint_text='0.00',
-                input_filter='float',
+                input_filter=self.filter_amount,
                 multiline=False,
-                size_hint_x=0.6
+                size_hint_x=0.6 if asset_id in METAL_FIELDS else 0.4
             )
             self.asset_inputs[asset_id] = asset_input
             
             asset_layout.add_widget(asset_label)
             asset_layout.add_widget(asset_input)
+            
+            # Gold and silver are entered in grams
+            if asset_id in MONETARY_FIELDS:
+                currency_input = Spinner(
+                    text=DEFAULT_CURRENCY,
+                    values=CURRENCIES,
+                    size_hint_x=0.2
+                )
+                self.currency_inputs[asset_id] = currency_input
+                asset_layout.add_widget(currency_input)
+            
             form_layout.add_widget(asset_layout)
         
         # Calculate button
@@ -171,71 +228,105 @@ class CalculatorScreen(Screen):
     def go_back(self, instance):
         self.manager.current = 'home'
     
+    def filter_amount(self, substring, from_undo):
+        return ''.join(char for char in substring if char in AMOUNT_CHARS)
+    
     def calculate_zakaat(self, instance):
+        # Don't let a failed calculation save the previous result
+        if hasattr(self, 'current_calculation'):
+            del self.current_calculation
+        
+        # Only fields whose text changed since the last press are reparsed
+        for asset_id, input_widget in self.asset_inputs.items():
+            self.form.update(asset_id, input_widget.text)
+        
+        if not self.form.is_valid():
+            self.result_label.text = "Please correct:\n" + "\n".join(
+                f"{asset_name}: {self.form.errors[asset_id]}"
+                for asset_id, asset_name in ASSET_FIELDS if asset_id in self.form.errors
+            )
+            return
+        assets = dict(self.form.values)
+        
+        currency = self.reporting_currency.text
+        asset_currencies = {asset_id: spinner.text
+                            for asset_id, spinner in self.currency_inputs.items()}
+        
+        # Rates may be fetched over the network, so convert off the UI thread
+        self.calculation_id += 1
+        self.result_label.text = 'Fetching exchange rates...'
+        thread = threading.Thread(
+            target=self.convert_assets,
+            args=(self.calculation_id, assets, asset_currencies, currency),
+            daemon=True
+        )
+        thread.start()
+    
+    def convert_assets(self, calculation_id, assets, asset_currencies, currency):
+        # Convert monetary assets to the reporting currency
+        monetary_ids = list(asset_currencies)
         try:
-            # Get values from inputs
-            assets = {}
-            for asset_id, input_widget in self.asset_inputs.items():
-                try:
-                    value = float(input_widget.text) if input_widget.text else 0
-                    assets[asset_id] = value
-                except ValueError:
-                    assets[asset_id] = 0
-            
-            # Calculate total assets
-            gold_value = assets.get('gold', 0)
-            silver_value = assets.get('silver', 0)
-            
-            total_assets = (
-                assets.get('cash', 0) +
-                assets.get('bank_balance', 0) +
-                assets.get('investments', 0) +
-                assets.get('business_assets', 0) +
-                assets.get('rental_income', 0) +
-                assets.get('other_assets', 0)
+            converted, rates = convert_amounts(
+                [assets[asset_id] for asset_id in monetary_ids],
+                [asset_currencies[asset_id] for asset_id in monetary_ids],
+                currency,
+                self.rate_provider
             )
-            
-            # Subtract debts
-            net_assets = total_assets - assets.get('debts', 0)
-            
-            # Check if assets meet Nisab threshold
-            # For simplicity, we're using a fixed gold price. In a real app, you'd fetch current prices.
-            gold_price_per_gram = 60  # Example price in USD
-            silver_price_per_gram = 0.8  # Example price in USD
-            
-            nisab_gold_value = NISAB_GOLD * gold_price_per_gram
-            nisab_silver_value = NISAB_SILVER * silver_price_per_gram
-            
-            # Use the lower of the two Nisab values
-            nisab_threshold = min(nisab_gold_value, nisab_silver_value)
-            
-            # Add value of gold and silver
-            gold_total_value = gold_value * gold_price_per_gram
-            silver_total_value = silver_value * silver_price_per_gram
-            
-            net_assets += gold_total_value + silver_total_value
-            
-            # Calculate Zakaat if above Nisab
-            if net_assets >= nisab_threshold:
-                zakaat_amount = net_assets * ZAKAAT_RATE
-                self.result_label.text = f"Your total Zakaat is: ${zakaat_amount:.2f}\n" \
-                                        f"Based on net assets of: ${net_assets:.2f}"
-            else:
-                self.result_label.text = f"Your net assets (${net_assets:.2f}) are below " \
-                                        f"the Nisab threshold (${nisab_threshold:.2f}).\n" \
-                                        f"No Zakaat is due."
-            
-            # Store calculation for potential saving
-            self.current_calculation = {
-                'date': datetime.now().strftime('%Y-%m-%d %H:%M'),
-                'assets': assets,
-                'net_assets': net_assets,
-                'zakaat_amount': zakaat_amount if net_assets >= nisab_threshold else 0,
-                'nisab_threshold': nisab_threshold
-            }
-            
+            # Metal prices are quoted in USD
+            metal_rate = self.rate_provider.rate(METAL_PRICE_CURRENCY, currency)
+        except RateUnavailable as e:
+            self.show_error(calculation_id, str(e))
+            return
         except Exception as e:
-            self.result_label.text = f"Error in calculation: {str(e)}"
+            # Otherwise the thread dies and the label keeps saying 'Fetching'
+            self.show_error(calculation_id, f"Unexpected error: {e}")
+            return
+        converted_assets = dict(assets)
+        converted_assets.update(zip(monetary_ids, converted))
+        self.show_calculation(calculation_id, assets, asset_currencies, currency,
+                              converted_assets, rates, metal_rate)
+    
+    @mainthread
+    def show_error(self, calculation_id, message):
+        # Ignore results of a calculation that has been superseded
+        if calculation_id == self.calculation_id:
+            self.result_label.text = f"Error in calculation: {message}"
+    
+    @mainthread
+    def show_calculation(self, calculation_id, assets, asset_currencies, currency,
+                         converted_assets, rates, metal_rate):
+        if calculation_id != self.calculation_id:
+            return
+        
+        rates[pair_key(METAL_PRICE_CURRENCY, currency)] = metal_rate
+        result = calculate(
+            converted_assets,
+            gold_price_per_gram=GOLD_PRICE_PER_GRAM * metal_rate,
+            silver_price_per_gram=SILVER_PRICE_PER_GRAM * metal_rate
+        )
+        net_assets = result['net_assets']
+        nisab_threshold = result['nisab_threshold']
+        zakaat_amount = result['zakaat_amount']
+        
+        if net_assets >= nisab_threshold:
+            self.result_label.text = f"Your total Zakaat is: {format_amount(zakaat_amount, currency)}\n" \
+                                    f"Based on net assets of: {format_amount(net_assets, currency)}"
+        else:
+            self.result_label.text = f"Your net assets ({format_amount(net_assets, currency)}) are below " \
+                                    f"the Nisab threshold ({format_amount(nisab_threshold, currency)}).\n" \
+                                    f"No Zakaat is due."
+        
+        # Store calculation for potential saving
+        self.current_calculation = {
+            'date': datetime.now().strftime('%Y-%m-%d %H:%M'),
+            'assets': assets,
+            'asset_currencies': asset_currencies,
+            'currency': currency,
+            'rates': rates,
+            'net_assets': net_assets,
+            'zakaat_amount': zakaat_amount,
+            'nisab_threshold': nisab_threshold
+        }
     
     def save_calculation(self, instance):
         if not hasattr(self, 'current_calculation'):
@@ -249,13 +340,12 @@ class CalculatorScreen(Screen):
         
         try:
             # Get the data store
-            store = JsonStore('zakaat_history.json')
-            
             # Generate a unique key based on timestamp
             key = f"calc_{datetime.now().strftime('%Y%m%d%H%M%S')}"
             
             # Save the calculation
-            store.put(key, **self.current_calculation)
+            with DurableStore('zakaat_history.json') as store:
+                store.put(key, **self.current_calculation)
             
             popup = Popup(
                 title='Success',
@@ -385,10 +475,12 @@ class HistoryScreen(Screen):
         
         try:
             # Load saved calculations
-            if os.path.exists('zakaat_history.json'):
-                store = JsonStore('zakaat_history.json')
+            if store_exists('zakaat_history.json'):
+                # Read everything and close, so the store is not left locked
+                with DurableStore('zakaat_history.json') as store:
+                    calculations = [(key, store.get(key)) for key in store.keys()]
                 
-                if not store.keys():
+                if not calculations:
                     no_data_label = Label(
                         text='No saved calculations found',
                         size_hint_y=None,
@@ -397,13 +489,14 @@ class HistoryScreen(Screen):
                     content_layout.add_widget(no_data_label)
                 else:
                     # Display each saved calculation
-                    for key in store.keys():
-                        calc = store.get(key)
+                    for key, calc in calculations:
+                        # Older records predate currency support and are in USD
+                        currency = calc.get('currency', DEFAULT_CURRENCY)
                         
                         calc_layout = BoxLayout(
                             orientation='vertical',
                             size_hint_y=None,
-                            height=150,
+                            height=185,
                             padding=10,
                             spacing=5
                         )
@@ -416,14 +509,24 @@ class HistoryScreen(Screen):
                         )
                         
                         assets_label = Label(
-                            text=f"Net Assets: ${calc.get('net_assets', 0):.2f}",
+                            text=f"Net Assets: {format_amount(calc.get('net_assets', 0), currency)}",
                             size_hint_y=None,
                             height=30,
                             halign='left'
                         )
                         
                         zakaat_label = Label(
-                            text=f"Zakaat Amount: ${calc.get('zakaat_amount', 0):.2f}",
+                            text=f"Zakaat Amount: {format_amount(calc.get('zakaat_amount', 0), currency)}",
+                            size_hint_y=None,
+                            height=30,
+                            halign='left'
+                        )
+                        
+                        # Rates saved with the record, so no refetch is needed
+                        rates = calc.get('rates', {})
+                        rates_label = Label(
+                            text='Rates: ' + (', '.join(f"{pair} {rate:.4g}" for pair, rate in rates.items()
+                                                       if rate != 1) or 'none'),
                             size_hint_y=None,
                             height=30,
                             halign='left'
@@ -440,6 +543,7 @@ class HistoryScreen(Screen):
                         calc_layout.add_widget(date_label)
                         calc_layout.add_widget(assets_label)
                         calc_layout.add_widget(zakaat_label)
+                        calc_layout.add_widget(rates_label)
                         calc_layout.add_widget(delete_button)
                         
                         # Add a separator
@@ -471,8 +575,8 @@ class HistoryScreen(Screen):
     
     def delete_calculation(self, key):
         try:
-            store = JsonStore('zakaat_history.json')
-            store.delete(key)
+            with DurableStore('zakaat_history.json') as store:
+                store.delete(key)
             
             # Refresh the screen
             self.on_enter()
@@ -571,34 +675,37 @@ class RemindersScreen(Screen):
     
     def set_reminder(self, instance):
         try:
-            # Validate date
-            date_str = self.date_input.text
+            # Validate date; an empty field means today
             try:
-                start_date = datetime.strptime(date_str, '%Y-%m-%d')
-            except ValueError:
-                start_date = datetime.now()
+                start_date = parse_date(self.date_input.text, default=datetime.now())
+            except ValidationError as e:
+                popup = Popup(
+                    title='Invalid Date',
+                    content=Label(text=str(e)),
+                    size_hint=(0.8, 0.3)
+                )
+                popup.open()
+                return
             
             # Get reminder type and note
             reminder_type = self.reminder_type.text
             note = self.note_input.text
             
             # Calculate next reminder date based on type
-            if reminder_type == 'Annual':
-                next_date = start_date + timedelta(days=365)
-            elif reminder_type == 'Monthly':
-                next_date = start_date + timedelta(days=30)
-            else:  # Custom
-                next_date = start_date + timedelta(days=7)  # Default to weekly
+            next_date = next_reminder_date(reminder_type, start_date)
             
             # Save reminder
-            store = JsonStore('zakaat_reminders.json')
             key = f"reminder_{datetime.now().strftime('%Y%m%d%H%M%S')}"
             
-            store.put(key, 
-                     type=reminder_type,
-                     start_date=start_date.strftime('%Y-%m-%d'),
-                     next_date=next_date.strftime('%Y-%m-%d'),
-                     note=note)
+            with DurableStore('zakaat_reminders.json') as store:
+                store.put(key, 
+                         type=reminder_type,
+                         start_date=start_date.strftime('%Y-%m-%d'),
+                         next_date=next_date.strftime('%Y-%m-%d'),
+                         note=note)
+            
+            # Let the background service reschedule
+            App.get_running_app().restart_reminder_service()
             
             # Refresh reminders list
             self.load_reminders()
@@ -629,10 +736,12 @@ class RemindersScreen(Screen):
             self.reminders_layout.remove_widget(child)
         
         try:
-            if os.path.exists('zakaat_reminders.json'):
-                store = JsonStore('zakaat_reminders.json')
+            if store_exists('zakaat_reminders.json'):
+                # Read everything and close, so the service is not locked out
+                with DurableStore('zakaat_reminders.json') as store:
+                    reminders = [(key, store.get(key)) for key in store.keys()]
                 
-                if not store.keys():
+                if not reminders:
                     no_data_label = Label(
                         text='No reminders set',
                         size_hint_y=None,
@@ -641,8 +750,7 @@ class RemindersScreen(Screen):
                     self.reminders_layout.add_widget(no_data_label)
                 else:
                     # Display each reminder
-                    for key in store.keys():
-                        reminder = store.get(key)
+                    for key, reminder in reminders:
                         
                         reminder_layout = BoxLayout(
                             orientation='horizontal',
@@ -687,8 +795,8 @@ class RemindersScreen(Screen):
     
     def delete_reminder(self, key):
         try:
-            store = JsonStore('zakaat_reminders.json')
-            store.delete(key)
+            with DurableStore('zakaat_reminders.json') as store:
+                store.delete(key)
             
             # Refresh the reminders
             self.load_reminders()
@@ -701,8 +809,221 @@ class RemindersScreen(Screen):
             )
             popup.open()
 
+class ScenarioChart(Widget):
+    """Line chart of Zakaat due against gold price change."""
+    
+    def __init__(self, **kwargs):
+        super(ScenarioChart, self).__init__(**kwargs)
+        self.x_values = []
+        self.series = []
+        self.bind(pos=self.redraw, size=self.redraw)
+    
+    def plot(self, x_values, series):
+        self.x_values = x_values
+        self.series = series
+        self.redraw()
+    
+    def redraw(self, *args):
+        self.canvas.clear()
+        if not self.series or not self.x_values:
+            return
+        
+        padding = 10
+        left, bottom = self.x + padding, self.y + padding
+        width, height = self.width - 2 * padding, self.height - 2 * padding
+        min_x, max_x = min(self.x_values), max(self.x_values)
+        # A single gold change is drawn as a flat line across the chart
+        span_x = (max_x - min_x) or 1
+        max_y = max(max(values) for _, values in self.series) or 1
+        
+        with self.canvas:
+            # Axes
+            Color(1, 1, 1, 0.5)
+            Line(points=[left, bottom + height, left, bottom, left + width, bottom])
+            
+            for color, values in self.series:
+                Color(*color)
+                points = []
+                for x_value, y_value in zip(self.x_values, values):
+                    points.append(left + (x_value - min_x) / span_x * width)
+                    points.append(bottom + y_value / max_y * height)
+                if len(self.x_values) == 1:
+                    points += [left + width, points[1]]
+                Line(points=points, width=1.5)
+
+class ScenariosScreen(Screen):
+    def __init__(self, **kwargs):
+        super(ScenariosScreen, self).__init__(**kwargs)
+        main_layout = BoxLayout(orientation='vertical', padding=10, spacing=10)
+        
+        # Title and back button
+        header = BoxLayout(size_hint_y=None, height=50)
+        back_button = Button(text='Back', size_hint_x=None, width=100)
+        back_button.bind(on_press=self.go_back)
+        title = Label(text='What-If Scenarios')
+        
+        header.add_widget(back_button)
+        header.add_widget(title)
+        main_layout.add_widget(header)
+        
+        # Price changes
+        gold_layout = BoxLayout(size_hint_y=None, height=50)
+        gold_label = Label(text='Gold price changes (%)', size_hint_x=0.4)
+        self.gold_input = TextInput(text='-20, 0, 20', multiline=False, size_hint_x=0.6)
+        gold_layout.add_widget(gold_label)
+        gold_layout.add_widget(self.gold_input)
+        
+        silver_layout = BoxLayout(size_hint_y=None, height=50)
+        silver_label = Label(text='Silver price changes (%)', size_hint_x=0.4)
+        self.silver_input = TextInput(text='0', multiline=False, size_hint_x=0.6)
+        silver_layout.add_widget(silver_label)
+        silver_layout.add_widget(self.silver_input)
+        
+        # Asset adjustment over up to two assets, e.g. paying off a debt
+        # takes -1000 from Debts and -1000 from Cash
+        adjust_layouts = []
+        self.adjust_rows = []
+        for hint_text in ('Change, e.g. -1000', 'and, e.g. -1000'):
+            adjust_layout = BoxLayout(size_hint_y=None, height=50)
+            adjust_asset = Spinner(
+                text='No adjustment',
+                values=['No adjustment'] + [asset_name for _, asset_name in ASSET_FIELDS],
+                size_hint_x=0.6
+            )
+            adjust_input = TextInput(
+                hint_text=hint_text,
+                multiline=False,
+                size_hint_x=0.4
+            )
+            adjust_layout.add_widget(adjust_asset)
+            adjust_layout.add_widget(adjust_input)
+            adjust_layouts.append(adjust_layout)
+            self.adjust_rows.append((adjust_asset, adjust_input))
+        
+        run_button = Button(
+            text='Run Scenarios',
+            size_hint_y=None,
+            height=50
+        )
+        run_button.bind(on_press=self.run_scenarios)
+        
+        main_layout.add_widget(gold_layout)
+        main_layout.add_widget(silver_layout)
+        for adjust_layout in adjust_layouts:
+            main_layout.add_widget(adjust_layout)
+        main_layout.add_widget(run_button)
+        
+        # Results
+        self.chart = ScenarioChart(size_hint_y=0.5)
+        main_layout.add_widget(self.chart)
+        
+        scroll_view = ScrollView(size_hint_y=0.5)
+        self.results_label = Label(
+            text='Calculate Zakaat first, then run scenarios on the result',
+            font_name='RobotoMono-Regular',
+            markup=True,
+            size_hint_y=None,
+            text_size=(400, None),
+            halign='left',
+            valign='top'
+        )
+        self.results_label.bind(texture_size=self.results_label.setter('size'))
+        scroll_view.add_widget(self.results_label)
+        main_layout.add_widget(scroll_view)
+        
+        self.add_widget(main_layout)
+    
+    def go_back(self, instance):
+        self.manager.current = 'home'
+    
+    def run_scenarios(self, instance):
+        calculation = getattr(self.manager.get_screen('calculator'), 'current_calculation', None)
+        if calculation is None:
+            self.results_label.text = 'Please calculate Zakaat first'
+            return
+        
+        try:
+            gold_changes = parse_changes(self.gold_input.text)
+            silver_changes = parse_changes(self.silver_input.text)
+            adjustments = [('Current', {})]
+            asset_ids = {name: asset_id for asset_id, name in ASSET_FIELDS}
+            names = []
+            deltas = {}
+            for adjust_asset, adjust_input in self.adjust_rows:
+                if adjust_asset.text == 'No adjustment':
+                    continue
+                if not adjust_input.text.strip():
+                    raise ValidationError(f"Enter the amount to change {adjust_asset.text} by")
+                amount = parse_amount(adjust_input.text, allow_negative=True)
+                asset_id = asset_ids[adjust_asset.text]
+                deltas[asset_id] = deltas.get(asset_id, 0) + amount
+                names.append(f"{adjust_asset.text} {amount:+.2f}")
+            if deltas:
+                adjustments.append((', '.join(names), deltas))
+        except ValidationError as e:
+            self.results_label.text = f"Invalid input: {str(e)}"
+            return
+        
+        # Reuse the parsed and converted values of the last calculation
+        assets, gold_price, silver_price = calculation_inputs(calculation)
+        self.results_label.text = 'Calculating...'
+        thread = threading.Thread(
+            target=self.evaluate_scenarios,
+            args=(assets, gold_price, silver_price, gold_changes, silver_changes,
+                  adjustments, calculation['currency']),
+            daemon=True
+        )
+        thread.start()
+    
+    def evaluate_scenarios(self, assets, gold_price, silver_price, gold_changes,
+                           silver_changes, adjustments, currency):
+        # Runs off the UI thread
+        grid = evaluate(
+            [assets],
+            gold_price_per_gram=gold_price,
+            silver_price_per_gram=silver_price,
+            gold_changes=gold_changes,
+            silver_changes=silver_changes,
+            adjustments=adjustments
+        )
+        self.show_results(grid, currency)
+    
+    @mainthread
+    def show_results(self, grid, currency):
+        grid_totals = totals(grid)
+        series = []
+        lines = []
+        
+        for name, rows in zip(grid['adjustments'], grid_totals):
+            lines.append(f"{name} (rows: gold, columns: silver)")
+            lines.append(' ' * 8 + ''.join(f"{format_change(change):>12}"
+                                           for change in grid['silver_changes']))
+            for gold_change, row in zip(grid['gold_changes'], rows):
+                cells = ''.join(f"{due:>12.2f}" if above else f"{'below Nisab':>12}"
+                                for due, above in row)
+                lines.append(f"{format_change(gold_change):>8}{cells}")
+            lines.append('')
+            
+            # One chart line per silver change
+            for column, silver_change in enumerate(grid['silver_changes']):
+                color = CHART_COLORS[len(series) % len(CHART_COLORS)]
+                series.append((color, [row[column][0] for row in rows]))
+                hex_color = ''.join(f"{int(channel * 255):02x}" for channel in color)
+                lines.append(f"[color={hex_color}]---[/color] {name}, silver {format_change(silver_change)}")
+            lines.append('')
+        
+        lines.append(f"Amounts in {currency}")
+        self.chart.plot(grid['gold_changes'], series)
+        self.results_label.text = '\n'.join(lines)
+
 class ZakaatApp(App):
     def build(self):
+        # Read amounts with the device's decimal separator
+        try:
+            locale.setlocale(locale.LC_NUMERIC, '')
+        except locale.Error:
+            pass
+        
         # Create screen manager
         sm = ScreenManager()
         
@@ -712,51 +1033,54 @@ class ZakaatApp(App):
         sm.add_widget(InfoScreen(name='info'))
         sm.add_widget(HistoryScreen(name='history'))
         sm.add_widget(RemindersScreen(name='reminders'))
+        sm.add_widget(ScenariosScreen(name='scenarios'))
         
         # Check for reminders on startup
+        self.reminder_service_running = False
+        self.start_reminder_service()
         Clock.schedule_once(self.check_reminders, 5)
         
         return sm
     
+    def android_service(self):
+        from jnius import autoclass
+        activity = autoclass('org.kivy.android.PythonActivity').mActivity
+        # python-for-android names service classes <package>.Service<Name>
+        service = autoclass(f"{activity.getPackageName()}.Service{ANDROID_SERVICE_NAME}")
+        return service, activity
+    
+    def start_reminder_service(self):
+        # On desktop the service is run separately with `python reminders.py`
+        if platform != 'android':
+            return
+        try:
+            service, activity = self.android_service()
+            service.start(activity, '')
+            self.reminder_service_running = True
+        except Exception:
+            # Without the service in buildozer.spec, check_reminders still runs in-app
+            self.reminder_service_running = False
+    
+    def restart_reminder_service(self):
+        if platform != 'android':
+            notify_service()
+            return
+        if not self.reminder_service_running:
+            return
+        try:
+            service, activity = self.android_service()
+            service.stop(activity)
+            service.start(activity, '')
+        except Exception:
+            self.reminder_service_running = False
+    
     def check_reminders(self, dt):
+        # A running service delivers reminders itself; checking here too
+        # would deliver them twice
+        if self.reminder_service_running or service_running():
+            return
         try:
-            if os.path.exists('zakaat_reminders.json'):
-                store = JsonStore('zakaat_reminders.json')
-                today = datetime.now().strftime('%Y-%m-%d')
-                
-                for key in store.keys():
-                    reminder = store.get(key)
-                    next_date = reminder.get('next_date')
-                    
-                    if next_date == today:
-                        # Show notification
-                        note = reminder.get('note', '')
-                        message = f"Zakaat Reminder: {note}" if note else "Zakaat Reminder"
-                        
-                        popup = Popup(
-                            title='Zakaat Reminder',
-                            content=Label(text=message),
-                            size_hint=(0.8, 0.3)
-                        )
-                        popup.open()
-                        
-                        # Update next reminder date based on type
-                        reminder_type = reminder.get('type')
-                        current_date = datetime.strptime(next_date, '%Y-%m-%d')
-                        
-                        if reminder_type == 'Annual':
-                            new_date = current_date + timedelta(days=365)
-                        elif reminder_type == 'Monthly':
-                            new_date = current_date + timedelta(days=30)
-                        else:  # Custom
-                            new_date = current_date + timedelta(days=7)
-                        
-                        # Update the reminder
-                        store.put(key,
-                                 type=reminder.get('type'),
-                                 start_date=reminder.get('start_date'),
-                                 next_date=new_date.strftime('%Y-%m-%d'),
-                                 note=reminder.get('note'))
+            ReminderService(PopupSink()).run_once()
         except Exception:
             # Silently fail for reminders check
             pass